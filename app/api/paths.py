@@ -0,0 +1,15 @@
+from fastapi import HTTPException
+
+
+def sanitize_rel_path(path: str, detail: str = "Path must not contain ..") -> str:
+    """Canonicalize a user-supplied path relative to a mount root.
+
+    Leading slashes and empty or "." components are dropped; any ".." component is rejected.
+    """
+    parts: list[str] = []
+    for part in path.strip().split("/"):
+        if part == "..":
+            raise HTTPException(status_code=400, detail=detail)
+        if part and part != ".":
+            parts.append(part)
+    return "/".join(parts)
@@ -1,10 +1,13 @@
+import asyncio
+import shutil
 from pathlib import Path
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import and_, delete, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.paths import sanitize_rel_path
 from app.api.schemas import Exclusion, ExclusionCreate, ExclusionResult
 from app.core import models
 from app.core.config import settings as env_settings
@@ -13,47 +16,52 @@ from app.core.db import get_session
 router = APIRouter(prefix="/exclusions", tags=["exclusions"])
 
 
-def _sanitize(path: str) -> Path:
-    cleaned = path.strip().lstrip("/")
-    candidate = Path(cleaned)
-    if ".." in candidate.parts:
-        raise HTTPException(status_code=400, detail="Path must not contain ..")
-    return candidate
+def _remove_target(target: Path) -> None:
+    if not target.exists():
+        return
+    if target.is_dir():
+        shutil.rmtree(target, ignore_errors=True)
+    else:
+        try:
+            target.unlink()
+        except Exception:
+            pass
 
 
 async def _remove_outputs_for_path(session: AsyncSession, rel_path: Path) -> int:
     data_root = Path(env_settings.data_root)
     target_root = Path(env_settings.output_root)
-    abs_path = data_root / rel_path
-    result = await session.execute(select(models.ArchiveRecord))
-    records = result.scalars().all()
-    removed = 0
-    for rec in records:
-        try:
-            src = Path(rec.source_path)
-            if not src.is_relative_to(abs_path):
-                continue
-        except Exception:
+    abs_path = str(data_root / rel_path)
+    # Range scan on the source_path index: everything sorting between "<abs>/" and "<abs>0"
+    # ("0" follows "/" in code-point order) lives under abs_path. Unlike LIKE, this stays
+    # case-sensitive in SQLite.
+    prefix = abs_path.rstrip("/") + "/"
+    stmt = select(models.ArchiveRecord.id, models.ArchiveRecord.target_path).where(
+        or_(
+            models.ArchiveRecord.source_path == abs_path,
+            and_(
+                models.ArchiveRecord.source_path >= prefix,
+                models.ArchiveRecord.source_path < prefix[:-1] + "0",
+            ),
+        )
+    )
+    rows = (await session.execute(stmt)).all()
+    ids: list[int] = []
+    targets: list[Path] = []
+    for rec_id, target_path in rows:
+        target = Path(target_path)
+        if not target.is_relative_to(target_root):
             continue
-        target = Path(rec.target_path)
-        try:
-            target.relative_to(target_root)
-        except Exception:
-            continue
-        if target.exists():
-            if target.is_dir():
-                import shutil
-
-                shutil.rmtree(target, ignore_errors=True)
-            else:
-                try:
-                    target.unlink()
-                except Exception:
-                    pass
-        await session.delete(rec)
-        removed += 1
+        ids.append(rec_id)
+        targets.append(target)
+    # end the read transaction so the pooled connection is free while files are removed
+    await session.commit()
+    await asyncio.gather(*(asyncio.to_thread(_remove_target, target) for target in targets))
+    for start in range(0, len(ids), 500):
+        chunk = ids[start : start + 500]
+        await session.execute(delete(models.ArchiveRecord).where(models.ArchiveRecord.id.in_(chunk)))
     await session.commit()
-    return removed
+    return len(ids)
 
 
 @router.get("/", response_model=List[Exclusion])
@@ -64,7 +72,7 @@ async def list_exclusions(session: AsyncSession = Depends(get_session)):
 
 @router.post("/", response_model=ExclusionResult)
 async def add_exclusion(payload: ExclusionCreate, session: AsyncSession = Depends(get_session)):
-    rel = _sanitize(payload.path)
+    rel = Path(sanitize_rel_path(payload.path))
     exists = await session.execute(select(models.Exclusion).where(models.Exclusion.path == str(rel)))
     if existing := exists.scalars().first():
         removed = await _remove_outputs_for_path(session, rel)
@@ -1,4 +1,5 @@
 import os
+from operator import itemgetter
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Query
@@ -13,9 +14,8 @@ MAX_ENTRIES = 500
 
 def _normalize_root(root: str) -> Path:
     normalized = Path(root).resolve()
-    for allowed in env_settings.allowed_browse_roots:
-        if normalized == Path(allowed).resolve():
-            return normalized
+    if normalized in env_settings.resolved_browse_roots():
+        return normalized
     raise HTTPException(status_code=403, detail="Root not allowed")
 
 
@@ -31,35 +31,35 @@ def _resolve_browse_path(root: Path, subpath: str | None) -> Path:
     return candidate
 
 
-def _list_dirs(root: Path, target: Path) -> tuple[list[FsDir], bool]:
-    dirs: list[FsDir] = []
+def _list_dirs(target: Path, rel_prefix: str) -> tuple[list[FsDir], bool]:
+    # target is already resolved inside the root, so its real (non-symlink) child
+    # directories are too; symlinks are rejected by is_dir(follow_symlinks=False).
+    keyed: list[tuple[str, FsDir]] = []
     truncated = False
     try:
-        with os.scandir(target) as entries:
+        # bytes-mode scandir: only names of kept directories get decoded
+        with os.scandir(os.fsencode(target)) as entries:
             for entry in entries:
                 if not entry.is_dir(follow_symlinks=False):
                     continue
-                child = Path(entry.path).resolve()
-                if not child.is_relative_to(root):
-                    continue
-                rel = child.relative_to(root).as_posix()
-                dirs.append(FsDir(name=entry.name, path=rel))
-                if len(dirs) >= MAX_ENTRIES:
+                name = os.fsdecode(entry.name)
+                rel = f"{rel_prefix}/{name}" if rel_prefix else name
+                keyed.append((name.lower(), FsDir(name=name, path=rel)))
+                if len(keyed) >= MAX_ENTRIES:
                     truncated = True
                     break
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Directory not found")
     except PermissionError:
         raise HTTPException(status_code=403, detail="Permission denied")
-    dirs.sort(key=lambda d: d.name.lower())
-    return dirs, truncated
+    keyed.sort(key=itemgetter(0))
+    return [d for _, d in keyed], truncated
 
 
 @router.get("/roots", response_model=list[FsRoot])
 async def list_roots():
     roots: list[FsRoot] = []
-    for raw in env_settings.allowed_browse_roots:
-        resolved = Path(raw).resolve()
+    for resolved in env_settings.resolved_browse_roots():
         roots.append(FsRoot(path=str(resolved), available=resolved.exists() and resolved.is_dir()))
     return roots
 
@@ -76,7 +76,7 @@ async def list_directory(root: str = Query(...), path: str = Query(default="")):
         raise HTTPException(status_code=404, detail="Directory not found")
     if not target.is_dir():
         raise HTTPException(status_code=400, detail="Path must be a directory")
-    dirs, truncated = _list_dirs(resolved_root, target)
     rel = target.relative_to(resolved_root)
     rel_str = rel.as_posix() if str(rel) != "." else ""
+    dirs, truncated = _list_dirs(target, rel_str)
     return FsList(root=str(resolved_root), path=rel_str, abs=str(target), dirs=dirs, truncated=truncated)
@@ -1,13 +1,18 @@
-import json
+import asyncio
+import os
+import shutil
 import zipfile
 from datetime import datetime
 from pathlib import Path
 from typing import List
 
+import orjson
 from fastapi import APIRouter, Body, Depends, File, Form, HTTPException, UploadFile
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
+from app.api.paths import sanitize_rel_path
 from app.api.schemas import (
     DiscoveredGallery,
     DuplicateGroup,
@@ -17,7 +22,8 @@ from app.api.schemas import (
 )
 from app.core import models
 from app.core.config import settings as env_settings
-from app.core.db import get_session
+from app.core.db import SessionLocal, get_session
+from app.core.signatures import canonical_signature
 from app.services.scan_service import (
     _discover_galleries,
     _gallery_signature,
@@ -33,6 +39,9 @@ from app.services.status_service import set_status
 router = APIRouter(prefix="/galleries", tags=["galleries"])
 
 
+STREAM_BATCH_SIZE = 1000
+
+
 def _stat_file(path: Path) -> tuple[bool, int | None, datetime | None]:
     try:
         st = path.stat()
@@ -45,26 +54,36 @@ def _stat_file(path: Path) -> tuple[bool, int | None, datetime | None]:
 
 @router.get("/output", response_model=List[GalleryOutput])
 async def list_output_galleries(session: AsyncSession = Depends(get_session)):
-    result = await session.execute(
-        select(models.ArchiveRecord).where(models.ArchiveRecord.type.in_(["galleryzip", "foldercopy"]))
+    result = await session.stream_scalars(
+        select(models.ArchiveRecord)
+        .options(
+            load_only(
+                models.ArchiveRecord.target_path,
+                models.ArchiveRecord.virtual_target_path,
+                models.ArchiveRecord.type,
+                models.ArchiveRecord.last_seen_at,
+            )
+        )
+        .where(models.ArchiveRecord.type.in_(["galleryzip", "foldercopy"]))
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
     )
-    records = result.scalars().all()
     items: list[GalleryOutput] = []
-    for rec in records:
-        path = Path(rec.target_path)
-        exists, size, mtime = _stat_file(path)
-        items.append(
-            GalleryOutput(
-                path=str(path),
-                virtual_path=rec.virtual_target_path,
-                record_type=rec.type,  # type: ignore[arg-type]
-                exists=exists,
-                size=size,
-                mtime=mtime,
-                last_seen_at=rec.last_seen_at,
+    async for records in result.partitions():
+        stats = await asyncio.gather(*(asyncio.to_thread(_stat_file, Path(rec.target_path)) for rec in records))
+        for rec, (exists, size, mtime) in zip(records, stats):
+            items.append(
+                GalleryOutput(
+                    path=rec.target_path,
+                    virtual_path=rec.virtual_target_path,
+                    record_type=rec.type,  # type: ignore[arg-type]
+                    exists=exists,
+                    size=size,
+                    mtime=mtime,
+                    last_seen_at=rec.last_seen_at,
+                )
             )
-        )
-    return sorted(items, key=lambda i: i.path.lower())
+    items.sort(key=lambda i: i.path.lower())
+    return items
 
 
 @router.get("/discovered", response_model=List[DiscoveredGallery])
@@ -73,10 +92,12 @@ async def list_discovered_galleries(session: AsyncSession = Depends(get_session)
     result = await session.execute(select(models.Source).where(models.Source.enabled == True))  # noqa: E712
     sources = result.scalars().all()
     data_root = Path(env_settings.data_root)
+    base_paths = [data_root / source.path for source in sources]
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_discover_galleries, base_path, data_root, settings) for base_path in base_paths)
+    )
     discovered: list[DiscoveredGallery] = []
-    for source in sources:
-        base_path = data_root / source.path
-        galleries, _, _ = _discover_galleries(base_path, data_root, settings)
+    for source, base_path, (galleries, _, _) in zip(sources, base_paths, results):
         for gal in galleries:
             sig = gal.signature
             discovered.append(
@@ -131,79 +152,122 @@ async def preview_gallery(path: str):
         kind = "zip"
         try:
             with zipfile.ZipFile(target, "r") as zf:
-                for name in zf.namelist()[:50]:
-                    entries.append(name)
-                if len(zf.namelist()) > len(entries):
-                    truncated = True
+                infos = zf.infolist()
+                entries.extend(info.filename for info in infos[:50])
+                truncated = len(infos) > len(entries)
         except Exception:
             entries.append("[unable to read archive]")
     return GalleryPreview(path=str(target), kind=kind, exists=True, size=size, mtime=mtime, entries=entries, truncated=truncated)
 
 
-def _signature_key(rec: models.ArchiveRecord) -> str:
-    try:
-        sig = json.loads(rec.signature_json or "{}")
-        return json.dumps(sig, sort_keys=True)
-    except Exception:
-        return ""
+def _duplicate_group(recs: list[models.ArchiveRecord], acked: set[str]) -> DuplicateGroup:
+    entries = []
+    key = ""
+    for rec in recs:
+        exists = Path(rec.target_path).exists()
+        try:
+            signature = orjson.loads(rec.signature_json or "{}")
+        except Exception:
+            signature = None
+        if not key and signature is not None:
+            key = canonical_signature(signature)
+        entries.append(
+            {
+                "path": rec.target_path,
+                "virtual_path": rec.virtual_target_path,
+                "record_type": rec.type,
+                "signature": signature,
+                "last_seen_at": rec.last_seen_at,
+                "exists": exists,
+            }
+        )
+    return DuplicateGroup(
+        signature_key=key,
+        count=len(entries),
+        entries=entries,  # type: ignore[arg-type]
+        acknowledged=key in acked,
+    )
 
 
 @router.get("/duplicates", response_model=List[DuplicateGroup])
 async def list_duplicates(session: AsyncSession = Depends(get_session)):
-    result = await session.execute(select(models.ArchiveRecord).where(models.ArchiveRecord.type.in_(["galleryzip", "foldercopy"])))
-    records = result.scalars().all()
-    groups: dict[str, list[models.ArchiveRecord]] = {}
-    for rec in records:
-        key = _signature_key(rec)
-        if not key:
-            continue
-        groups.setdefault(key, []).append(rec)
-    acked = load_acknowledged()
-    payload: list[DuplicateGroup] = []
-    for key, recs in groups.items():
-        if len(recs) < 2:
-            continue
-        entries = []
-        for rec in recs:
-            exists = Path(rec.target_path).exists()
-            try:
-                signature = json.loads(rec.signature_json or "{}")
-            except Exception:
-                signature = None
-            entries.append(
-                {
-                    "path": rec.target_path,
-                    "virtual_path": rec.virtual_target_path,
-                    "record_type": rec.type,
-                    "signature": signature,
-                    "last_seen_at": rec.last_seen_at,
-                    "exists": exists,
-                }
-            )
-        payload.append(
-            DuplicateGroup(
-                signature_key=key,
-                count=len(entries),
-                entries=entries,  # type: ignore[arg-type]
-                acknowledged=key in acked,
+    output_types = ["galleryzip", "foldercopy"]
+    dup_hashes = (
+        select(models.ArchiveRecord.signature_hash)
+        .where(
+            models.ArchiveRecord.type.in_(output_types),
+            models.ArchiveRecord.signature_hash.is_not(None),
+        )
+        .group_by(models.ArchiveRecord.signature_hash)
+        .having(func.count() > 1)
+    )
+    result = await session.stream_scalars(
+        select(models.ArchiveRecord)
+        .options(
+            load_only(
+                models.ArchiveRecord.target_path,
+                models.ArchiveRecord.virtual_target_path,
+                models.ArchiveRecord.type,
+                models.ArchiveRecord.signature_json,
+                models.ArchiveRecord.signature_hash,
+                models.ArchiveRecord.last_seen_at,
             )
         )
+        .where(
+            models.ArchiveRecord.type.in_(output_types),
+            models.ArchiveRecord.signature_hash.in_(dup_hashes),
+        )
+        .order_by(models.ArchiveRecord.signature_hash, models.ArchiveRecord.id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    acked = await asyncio.to_thread(load_acknowledged)
+    payload: list[DuplicateGroup] = []
+    # only hashes shared by several outputs are fetched; rows arrive ordered by hash,
+    # so only the group being built is kept in memory
+    group: list[models.ArchiveRecord] = []
+    async for rec in result:
+        if group and rec.signature_hash != group[0].signature_hash:
+            payload.append(_duplicate_group(group, acked))
+            group = []
+        group.append(rec)
+    if group:
+        payload.append(_duplicate_group(group, acked))
     payload.sort(key=lambda g: g.count, reverse=True)
     return payload
 
 
 @router.post("/duplicates/ack")
 async def ack_duplicates(keys: List[str] = Body(...)):
-    mark_acknowledged(keys)
+    await asyncio.to_thread(mark_acknowledged, keys)
     return {"status": "ok", "acknowledged": keys}
 
 
-def _sanitize_rel(path: str) -> Path:
-    cleaned = path.strip().lstrip("/")
-    candidate = Path(cleaned)
-    if ".." in candidate.parts:
-        raise HTTPException(status_code=400, detail="Path must not contain ..")
-    return candidate
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _save_upload(src, dest_path: Path) -> None:
+    src.seek(0)
+    with dest_path.open("wb") as f:
+        shutil.copyfileobj(src, f, UPLOAD_CHUNK_SIZE)
+
+
+def _check_member_name(name: str, extract_dir: str) -> None:
+    if name.startswith("/") or ".." in name.split("/"):
+        raise ValueError(f"Unsafe archive member: {name}")
+    target = os.path.normpath(os.path.join(extract_dir, name))
+    if target != extract_dir and not target.startswith(extract_dir + os.sep):
+        raise ValueError(f"Unsafe archive member: {name}")
+
+
+def _extract_archive(archive: Path, extract_dir: Path) -> None:
+    with zipfile.ZipFile(archive, "r") as zf:
+        infos = zf.infolist()
+        # validate the whole manifest before writing anything
+        root = os.path.normpath(str(extract_dir))
+        for info in infos:
+            _check_member_name(info.filename, root)
+        for info in infos:
+            zf.extract(info, extract_dir)
 
 
 @router.post("/import/upload", response_model=ImportResult)
@@ -213,7 +277,7 @@ async def import_upload(
     extract: bool = Form(default=False),
 ):
     output_root = Path(env_settings.output_root)
-    subdir = _sanitize_rel(target_subdir)
+    subdir = Path(sanitize_rel_path(target_subdir))
     dest_dir = (output_root / subdir).resolve()
     _safe_under_output(dest_dir)
     dest_dir.mkdir(parents=True, exist_ok=True)
@@ -221,40 +285,43 @@ async def import_upload(
     dest_path = dest_dir / filename
     if dest_path.exists():
         return ImportResult(saved_path=str(dest_path), skipped=True, reason="File already exists")
-    with dest_path.open("wb") as f:
-        while True:
-            chunk = await file.read(1024 * 1024)
-            if not chunk:
-                break
-            f.write(chunk)
+    await asyncio.to_thread(_save_upload, file.file, dest_path)
     if extract and dest_path.suffix.lower() in {".zip", ".cbz"}:
         extract_dir = dest_dir / dest_path.stem
         if extract_dir.exists():
             return ImportResult(saved_path=str(dest_path), skipped=True, reason="Extract target exists")
         extract_dir.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(dest_path, "r") as zf:
-            zf.extractall(extract_dir)
+        try:
+            await asyncio.to_thread(_extract_archive, dest_path, extract_dir)
+        except ValueError as exc:
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            raise HTTPException(status_code=400, detail=str(exc))
         return ImportResult(saved_path=str(dest_path), extracted=True, extract_path=str(extract_dir))
     return ImportResult(saved_path=str(dest_path))
 
 
 @router.post("/update")
-async def update_gallery(relative_path: str, session: AsyncSession = Depends(get_session)):
-    rel = _sanitize_rel(relative_path)
+async def update_gallery(relative_path: str):
+    rel = Path(sanitize_rel_path(relative_path))
     source_dir = Path(env_settings.data_root) / rel
     if not source_dir.exists() or not source_dir.is_dir():
         raise HTTPException(status_code=404, detail="Source directory not found")
-    settings = await get_settings(session)
-    images = _gather_gallery_files(source_dir, settings.image_extensions, settings.consider_images_in_subfolders)
+    # sessions are scoped to the DB work so no pooled connection is held while the zip is written
+    async with SessionLocal() as session:
+        settings = await get_settings(session)
+    images = await asyncio.to_thread(
+        _gather_gallery_files, source_dir, settings.image_ext_set, settings.consider_images_in_subfolders
+    )
     if not images:
         raise HTTPException(status_code=400, detail="No images to zip in this folder")
-    signature = _gallery_signature(images)
+    signature = await asyncio.to_thread(_gallery_signature, images)
     extension = settings.archive_extension_for_galleries.lstrip(".")
     rel_file = rel.parent / f"{rel.name}.{extension}"
     flatten_name_map: dict[str, str] = {}
     target_path, virtual_target = _resolve_output_file(rel_file, settings.replicate_nesting, settings.lanraragi_flatten, flatten_name_map)
     set_status("scanning", message=f"Updating {rel}", progress=None, meta={"manual_update": True})
-    _write_zip(source_dir, images, target_path)
-    await _upsert_record(session, target_path, source_dir, "galleryzip", signature, virtual_target_path=virtual_target)
+    await asyncio.to_thread(_write_zip, source_dir, images, target_path)
+    async with SessionLocal() as session:
+        await _upsert_record(session, target_path, source_dir, "galleryzip", signature, virtual_target_path=virtual_target)
     set_status("standby", message="Idle", progress=None, meta={"last_update": str(rel)})
     return {"status": "updated", "target_path": str(target_path), "virtual_target": str(virtual_target), "signature": signature}
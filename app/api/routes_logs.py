@@ -1,4 +1,4 @@
-from collections import deque
+import os
 from pathlib import Path
 from typing import Literal
 
@@ -9,14 +9,33 @@ from app.core.config import settings as env_settings
 router = APIRouter(prefix="/logs", tags=["logs"])
 
 
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
 def _tail(path: Path, lines: int) -> list[str]:
     if not path.exists():
         return []
-    buf: deque[str] = deque(maxlen=lines)
-    with path.open("r", encoding="utf-8", errors="ignore") as fh:
-        for line in fh:
-            buf.append(line.rstrip("\n"))
-    return list(buf)
+    blocks: list[bytes] = []
+    newlines = 0
+    with path.open("rb") as fh:
+        pos = fh.seek(0, os.SEEK_END)
+        # one newline more than requested guarantees the first kept line is complete
+        while pos > 0 and newlines <= lines:
+            step = min(TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            fh.seek(pos)
+            block = fh.read(step)
+            newlines += block.count(b"\n")
+            blocks.append(block)
+    data = b"".join(reversed(blocks))
+    if not data:
+        return []
+    chunks = data.split(b"\n")
+    if data.endswith(b"\n"):
+        chunks.pop()
+    if pos > 0:
+        chunks = chunks[1:]
+    return [chunk.rstrip(b"\r").decode("utf-8", errors="ignore") for chunk in chunks[-lines:]]
 
 
 @router.get("/")
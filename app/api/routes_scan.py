@@ -1,5 +1,6 @@
-import asyncio
 from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.schemas import DiffResult, LastScans, ScanResult
 from app.core.db import get_session, SessionLocal
@@ -8,17 +9,23 @@ from app.worker.jobs import enqueue, job_status
 
 router = APIRouter(prefix="/scan", tags=["scan"])
 
+
+def _model_response(model: BaseModel) -> Response:
+    # scan payloads can hold thousands of actions; let pydantic-core write the JSON in
+    # one pass instead of re-validating against response_model and encoding again
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
 @router.post("/dryrun", response_model=ScanResult)
 async def dry_run_scan(session: AsyncSession = Depends(get_session)):
-    return await perform_scan(session, dry_run=True)
+    return _model_response(await perform_scan(session, dry_run=True))
 
 @router.post("/diff", response_model=DiffResult)
 async def diff_scan(session: AsyncSession = Depends(get_session)):
-    return await compute_diff(session)
+    return _model_response(await compute_diff(session))
 
 @router.get("/last", response_model=LastScans)
 async def last_scans():
-    return get_last_results()
+    return _model_response(LastScans(**get_last_results()))
 
 @router.post("/run")
 async def run_scan():
@@ -26,7 +33,7 @@ async def run_scan():
         async with SessionLocal() as job_session:
             await perform_scan(job_session, dry_run=False)
 
-    job_id = enqueue("scan_run", lambda: asyncio.run(_job()))
+    job_id = enqueue("scan_run", _job)
     return {"job_id": job_id, "status": "queued"}
 
 @router.get("/jobs/{job_id}")
@@ -1,19 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.paths import sanitize_rel_path
 from app.api.schemas import SourceCreate, SourceUpdate, SourceOut
 from app.core import models
 from app.core.db import get_session
 
 router = APIRouter(prefix="/sources", tags=["sources"])
 
-def _sanitize_path(path: str) -> str:
-    cleaned = path.strip()
-    while cleaned.startswith("/"):
-        cleaned = cleaned[1:]
-    if ".." in cleaned.split("/"):
-        raise HTTPException(status_code=400, detail="Path must be under /data without .. components")
-    return cleaned
+SOURCE_PATH_ERROR = "Path must be under /data without .. components"
 
 @router.get("/", response_model=list[SourceOut])
 async def list_sources(session: AsyncSession = Depends(get_session)):
@@ -22,7 +17,7 @@ async def list_sources(session: AsyncSession = Depends(get_session)):
 
 @router.post("/", response_model=SourceOut)
 async def create_source(payload: SourceCreate, session: AsyncSession = Depends(get_session)):
-    cleaned_path = _sanitize_path(payload.path)
+    cleaned_path = sanitize_rel_path(payload.path, SOURCE_PATH_ERROR)
     source = models.Source(
         name=payload.name,
         path=cleaned_path,
@@ -42,7 +37,7 @@ async def update_source(source_id: int, payload: SourceUpdate, session: AsyncSes
     if payload.name is not None:
         source.name = payload.name
     if payload.path is not None:
-        source.path = _sanitize_path(payload.path)
+        source.path = sanitize_rel_path(payload.path, SOURCE_PATH_ERROR)
     if payload.enabled is not None:
         source.enabled = payload.enabled
     if payload.scan_mode is not None:
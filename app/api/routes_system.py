@@ -1,5 +1,7 @@
 import os
 import subprocess
+import time
+from functools import lru_cache
 from pathlib import Path
 
 from fastapi import APIRouter, Depends
@@ -12,18 +14,34 @@ from app.services.settings_service import get_settings
 
 router = APIRouter(prefix="/system", tags=["system"])
 
+STATVFS_TTL_SECONDS = 5.0
+_statvfs_cache: dict[str, tuple[float, DiskInfo]] = {}
+
 
 def _stat_path(path: str) -> DiskInfo:
+    key = str(path)
+    now = time.monotonic()
+    cached = _statvfs_cache.get(key)
+    if cached and now - cached[0] < STATVFS_TTL_SECONDS:
+        return cached[1]
     try:
         st = os.statvfs(path)
-        total = st.f_frsize * st.f_blocks
-        free = st.f_frsize * st.f_bfree
-        avail = st.f_frsize * st.f_bavail
     except Exception:  # pragma: no cover - platform dependent
-        total = free = avail = 0
-    return DiskInfo(path=str(path), total_bytes=total, free_bytes=free, available_bytes=avail)
+        # keep serving the last good reading through transient errors
+        if cached:
+            return cached[1]
+        return DiskInfo(path=key, total_bytes=0, free_bytes=0, available_bytes=0)
+    info = DiskInfo(
+        path=key,
+        total_bytes=st.f_frsize * st.f_blocks,
+        free_bytes=st.f_frsize * st.f_bfree,
+        available_bytes=st.f_frsize * st.f_bavail,
+    )
+    _statvfs_cache[key] = (now, info)
+    return info
 
 
+@lru_cache(maxsize=1)
 def _resolve_commit() -> str | None:
     for key in ("GIT_COMMIT", "SOURCE_COMMIT", "COMMIT"):
         val = os.getenv(key)
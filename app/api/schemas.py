@@ -1,18 +1,51 @@
-from typing import List, Optional, Literal, Dict, Any
-from pydantic import BaseModel, Field
+from enum import Enum
+from functools import cached_property
+from typing import Annotated, List, Optional, Literal, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, create_model
 from datetime import datetime
 
+
+# str enums validate by hashed lookup; models using them set use_enum_values so
+# the parsed value stays a plain str for the services and the database.
+class ScanMode(str, Enum):
+    both = "both"
+    archives_only = "archives_only"
+    folders_only = "folders_only"
+
+
+class OutputMode(str, Enum):
+    zip = "zip"
+    foldercopy = "foldercopy"
+    zip_foldercopy = "zip+foldercopy"
+
+
+class GalleryArchiveExt(str, Enum):
+    zip = "zip"
+    cbz = "cbz"
+
+
+class DiffStatus(str, Enum):
+    new = "new"
+    changed = "changed"
+    missing = "missing"
+    unchanged = "unchanged"
+
+
 class SourceCreate(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
     name: str
     path: str
     enabled: bool = True
-    scan_mode: Literal["both", "archives_only", "folders_only"] = "both"
+    scan_mode: ScanMode = "both"
 
 class SourceUpdate(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
     name: Optional[str] = None
     path: Optional[str] = None
     enabled: Optional[bool] = None
-    scan_mode: Optional[Literal["both", "archives_only", "folders_only"]] = None
+    scan_mode: Optional[ScanMode] = None
 
 class SourceOut(BaseModel):
     id: int
@@ -26,15 +59,17 @@ class SourceOut(BaseModel):
         from_attributes = True
 
 class SettingsPayload(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
     zip_galleries: bool
     update_gallery_zips: bool
     replicate_nesting: bool
     leaf_only: bool
     consider_images_in_subfolders: bool
-    output_mode: Literal["zip", "foldercopy", "zip+foldercopy"]
+    output_mode: OutputMode
     copy_sidecars: bool
     lanraragi_flatten: bool
-    archive_extension_for_galleries: Literal["zip", "cbz"]
+    archive_extension_for_galleries: GalleryArchiveExt
     debug_logging: bool
     auto_scan_enabled: bool
     auto_scan_interval_minutes: int = Field(ge=1)
@@ -43,28 +78,39 @@ class SettingsPayload(BaseModel):
     archive_extensions: List[str]
     image_extensions: List[str]
 
-class SettingsUpdate(BaseModel):
-    zip_galleries: Optional[bool] = None
-    update_gallery_zips: Optional[bool] = None
-    replicate_nesting: Optional[bool] = None
-    leaf_only: Optional[bool] = None
-    consider_images_in_subfolders: Optional[bool] = None
-    output_mode: Optional[Literal["zip", "foldercopy", "zip+foldercopy"]] = None
-    copy_sidecars: Optional[bool] = None
-    lanraragi_flatten: Optional[bool] = None
-    archive_extension_for_galleries: Optional[Literal["zip", "cbz"]] = None
-    debug_logging: Optional[bool] = None
-    auto_scan_enabled: Optional[bool] = None
-    auto_scan_interval_minutes: Optional[int] = Field(default=None, ge=1)
-    duplicates_enabled: Optional[bool] = None
-    min_images_to_be_gallery: Optional[int] = Field(default=None, ge=1)
-    archive_extensions: Optional[List[str]] = None
-    image_extensions: Optional[List[str]] = None
+    # normalized lookup sets for the scan hot path, built once per loaded payload
+    @cached_property
+    def archive_ext_set(self) -> frozenset[str]:
+        return frozenset(ext.lower().lstrip(".") for ext in self.archive_extensions)
+
+    @cached_property
+    def image_ext_set(self) -> frozenset[str]:
+        return frozenset(ext.lower().lstrip(".") for ext in self.image_extensions)
+
+def _optional_fields(model: type[BaseModel]) -> Dict[str, Any]:
+    """Field definitions for a partial-update copy of ``model``, keeping constraints."""
+    fields: Dict[str, Any] = {}
+    for name, info in model.model_fields.items():
+        annotation = info.annotation
+        if info.metadata:
+            annotation = Annotated[(annotation, *info.metadata)]
+        fields[name] = (Optional[annotation], None)
+    return fields
+
+
+# every settings field, each optional for partial PUTs; generated so the two cannot drift
+SettingsUpdate = create_model(
+    "SettingsUpdate",
+    __config__=ConfigDict(use_enum_values=True),
+    **_optional_fields(SettingsPayload),
+)
 
 class SettingsOut(SettingsPayload):
     updated_at: Optional[datetime] = None
 
 class PlanAction(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     action: str
     type: Optional[str] = None
     source_path: str
@@ -79,6 +125,8 @@ class PlanAction(BaseModel):
     bytes: Optional[int] = None
 
 class ScanSummary(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     archives_to_copy: int = 0
     galleries_to_zip: int = 0
     skipped_existing: int = 0
@@ -89,20 +137,23 @@ class ScanSummary(BaseModel):
     reason_counts: Dict[str, int] = Field(default_factory=dict)
 
 class ScanResult(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     summary: ScanSummary
     actions: List[PlanAction]
 
 class ActivityOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
     ts: datetime
     level: str
     message: str
     payload_json: str
 
-    class Config:
-        from_attributes = True
-
 
 class DiskInfo(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     path: str
     total_bytes: int
     free_bytes: int
@@ -110,6 +161,8 @@ class DiskInfo(BaseModel):
 
 
 class SystemInfo(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     data_root: str
     output_root: str
     config_root: str
@@ -128,7 +181,9 @@ class SystemInfo(BaseModel):
 
 
 class DiffItem(BaseModel):
-    status: Literal["new", "changed", "missing", "unchanged"]
+    model_config = ConfigDict(defer_build=True, use_enum_values=True)
+
+    status: DiffStatus
     target_path: str
     virtual_target_path: Optional[str] = None
     source_path: Optional[str] = None
@@ -137,6 +192,8 @@ class DiffItem(BaseModel):
 
 
 class DiffResult(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     new: List[DiffItem]
     changed: List[DiffItem]
     missing: List[DiffItem]
@@ -144,21 +201,29 @@ class DiffResult(BaseModel):
 
 
 class LastScans(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     dryrun: Optional[ScanResult] = None
     run: Optional[ScanResult] = None
 
 
 class FsRoot(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     path: str
     available: bool
 
 
 class FsDir(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     name: str
     path: str
 
 
 class FsList(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     root: str
     path: str
     abs: str
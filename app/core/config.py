@@ -1,3 +1,5 @@
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Optional
 
 from pydantic import AliasChoices, Field
@@ -24,6 +26,11 @@ class Settings(BaseSettings):
     zip_galleries: bool = True
     update_gallery_zips: bool = False
     use_hardlinks: bool = False  # usually off for Unraid user shares
+    gallery_zip_level: int = Field(1, ge=0, le=9)  # deflate level for compressible gallery entries
+    copy_workers: int = Field(4, ge=1)  # archive copies / gallery writes in flight during a scan
+    trust_dir_mtime: bool = False  # reuse stored gallery signatures while the gallery dir mtime is unchanged
+    zip_fast_io: bool = False  # sendfile stored gallery entries; CRC is read in a separate pass
+    auto_scan_watch: bool = False  # auto-scan reacts to filesystem events instead of polling mtimes
 
     # detection / planner defaults
     archive_extensions: List[str] = ["zip", "cbz"]
@@ -47,7 +54,20 @@ class Settings(BaseSettings):
                 roots.append(self.output_root)
             object.__setattr__(self, "allowed_browse_roots", roots)
 
+    def resolved_browse_roots(self) -> tuple[Path, ...]:
+        return _resolve_roots(tuple(self.allowed_browse_roots))
+
+
+@lru_cache(maxsize=8)
+def _resolve_roots(roots: tuple[str, ...]) -> tuple[Path, ...]:
+    return tuple(Path(root).resolve() for root in roots)
+
 
 APP_VERSION = "0.2.2"
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_env_settings() -> Settings:
+    return Settings()
+
+
+settings = get_env_settings()
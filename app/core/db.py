@@ -1,20 +1,51 @@
 import asyncio
 from pathlib import Path
-from sqlalchemy import text
+import orjson
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
+from .signatures import signature_hash
 
 db_path = Path(settings.config_root) / "galleryloom.db"
 db_path.parent.mkdir(parents=True, exist_ok=True)
 
 DATABASE_URL = f"sqlite+aiosqlite:///{db_path}"
 
+# aiosqlite defaults to NullPool, reconnecting (and re-running the pragmas) for every
+# session. Keep a small pool instead of a StaticPool: the scan worker runs its own event
+# loop and must not share a single connection with the API.
 engine = create_async_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False, "timeout": 30.0},
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=5,
+    max_overflow=5,
+    query_cache_size=1200,
 )
 
+# SQLite pragmas are per-connection, so apply them whenever the pool opens one.
+# synchronous=NORMAL is durable under WAL except for the last commits on power loss.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _CONNECTION_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 class Base(DeclarativeBase):
@@ -40,10 +71,9 @@ def init_db_sync():
 
 async def _apply_migrations(conn):
     """Lightweight, idempotent migrations for SQLite."""
-    async def _has_column(table: str, column: str) -> bool:
+    async def _columns(table: str) -> set[str]:
         result = await conn.execute(text(f"PRAGMA table_info({table});"))
-        cols = [row[1] for row in result.fetchall()]
-        return column in cols
+        return {row[1] for row in result.fetchall()}
 
     # settings table additions
     settings_columns = [
@@ -56,15 +86,64 @@ async def _apply_migrations(conn):
         ("auto_scan_enabled", "BOOLEAN DEFAULT 1"),
         ("auto_scan_interval_minutes", "INTEGER DEFAULT 30"),
     ]
+    settings_cols = await _columns("settings")
     for col, ddl in settings_columns:
-        if not await _has_column("settings", col):
+        if col not in settings_cols:
             await conn.execute(text(f"ALTER TABLE settings ADD COLUMN {col} {ddl};"))
 
     # archive_records additions
-    if not await _has_column("archive_records", "virtual_target_path"):
+    archive_cols = await _columns("archive_records")
+    if "virtual_target_path" not in archive_cols:
         await conn.execute(text("ALTER TABLE archive_records ADD COLUMN virtual_target_path TEXT;"))
+    result = await conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type='index' AND name='ix_archive_records_virtual_target_path';")
+    )
+    needs_analyze = result.fetchone() is None
+    if needs_analyze:
+        await conn.execute(
+            text("CREATE INDEX ix_archive_records_virtual_target_path ON archive_records (virtual_target_path);")
+        )
+    await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_archive_records_source_path ON archive_records (source_path);"))
+    if "signature_hash" not in archive_cols:
+        await conn.execute(text("ALTER TABLE archive_records ADD COLUMN signature_hash VARCHAR(32);"))
+    await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_archive_records_signature_hash ON archive_records (signature_hash);"))
+    await _backfill_signature_hashes(conn)
+    await _compact_signature_json(conn)
 
     # exclusions table
     result = await conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='exclusions';"))
     if not result.fetchone():
         await conn.execute(text("CREATE TABLE exclusions (id INTEGER PRIMARY KEY AUTOINCREMENT, path TEXT UNIQUE, created_at DATETIME DEFAULT CURRENT_TIMESTAMP);"))
+
+    # refresh planner statistics once when indexes were added to an existing database
+    if needs_analyze:
+        await conn.execute(text("ANALYZE;"))
+
+
+async def _backfill_signature_hashes(conn):
+    result = await conn.execute(text("SELECT id, signature_json FROM archive_records WHERE signature_hash IS NULL;"))
+    updates = []
+    for rec_id, signature_json in result.fetchall():
+        try:
+            signature = orjson.loads(signature_json or "{}")
+        except ValueError:
+            continue
+        updates.append({"id": rec_id, "hash": signature_hash(signature)})
+    if updates:
+        await conn.execute(text("UPDATE archive_records SET signature_hash = :hash WHERE id = :id;"), updates)
+
+
+async def _compact_signature_json(conn):
+    # rows written with json.dumps ("a": 1, ...) miss the scan's text comparison and get parsed on
+    # every scan; rewrite them once in the orjson form scans write (same values, so the hash holds)
+    result = await conn.execute(text("SELECT id, signature_json FROM archive_records WHERE signature_json LIKE '%: %';"))
+    updates = []
+    for rec_id, signature_json in result.fetchall():
+        try:
+            compact = orjson.dumps(orjson.loads(signature_json)).decode()
+        except ValueError:
+            continue
+        if compact != signature_json:
+            updates.append({"id": rec_id, "sig": compact})
+    if updates:
+        await conn.execute(text("UPDATE archive_records SET signature_json = :sig WHERE id = :id;"), updates)
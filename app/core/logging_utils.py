@@ -1,18 +1,36 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 _configured = False
 _current_debug = False
+_listener: QueueListener | None = None
+
+
+def _stop_listener():
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(_stop_listener)
 
 
 def setup_logging(config_root: Path, debug_enabled: bool = False):
     """
     Configure logging to stdout, a primary log file, and an optional debug log file under /config/logs.
+    Records are handed to a background listener thread so callers never block on file writes.
     Safe to call multiple times.
     """
     global _configured
     global _current_debug
+    global _listener
     if _configured and _current_debug == debug_enabled:
         return
     _current_debug = debug_enabled
@@ -52,10 +70,20 @@ def setup_logging(config_root: Path, debug_enabled: bool = False):
         except Exception as exc:  # pragma: no cover - startup-only path
             print(f"[GalleryLoom] Could not set up debug log file: {exc}")
 
+    formatter = logging.Formatter(fmt)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    _stop_listener()
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    queue_handler = QueueHandler(log_queue)
+    # QueueHandler bakes the message text into the record; keep it bare so the
+    # listener's handlers apply the real format exactly once
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
     logging.basicConfig(
         level=logging.DEBUG if debug_enabled else logging.INFO,
-        format=fmt,
-        handlers=handlers,
+        handlers=[queue_handler],
         force=True,
     )
     _configured = True
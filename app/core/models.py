@@ -10,7 +10,7 @@ class Source(Base):
     path: Mapped[str] = mapped_column(Text)  # must be under /data
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
     scan_mode: Mapped[str] = mapped_column(String(50), default="both")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
 
 class SettingsRow(Base):
     __tablename__ = "settings"
@@ -33,29 +33,30 @@ class SettingsRow(Base):
     image_extensions: Mapped[str] = mapped_column(
         Text, default='["jpg","jpeg","png","webp","gif","bmp","jfif"]'
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=func.now(), onupdate=func.now()
     )
 
 class ArchiveRecord(Base):
     __tablename__ = "archive_records"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     target_path: Mapped[str] = mapped_column(Text, unique=True, index=True)
-    virtual_target_path: Mapped[str | None] = mapped_column(Text, nullable=True)
-    source_path: Mapped[str] = mapped_column(Text)
+    virtual_target_path: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
+    source_path: Mapped[str] = mapped_column(Text, index=True)
     type: Mapped[str] = mapped_column(String(50))  # archive | galleryzip
     signature_json: Mapped[str] = mapped_column(Text, default="{}")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    signature_hash: Mapped[str | None] = mapped_column(String(32), nullable=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=func.now()
+        DateTime, default=func.now(), onupdate=func.now()
     )
-    last_seen_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
 
 class Activity(Base):
     __tablename__ = "activity"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    ts: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    ts: Mapped[datetime] = mapped_column(DateTime, default=func.now(), index=True)
     level: Mapped[str] = mapped_column(String(20), default="INFO")
     message: Mapped[str] = mapped_column(Text)
     payload_json: Mapped[str] = mapped_column(Text, default="{}")
@@ -65,4 +66,4 @@ class Exclusion(Base):
     __tablename__ = "exclusions"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     path: Mapped[str] = mapped_column(Text, unique=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
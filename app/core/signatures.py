@@ -0,0 +1,11 @@
+import hashlib
+import json
+
+
+def canonical_signature(signature: dict) -> str:
+    """Stable text form of a signature; also the key users acknowledge duplicates by."""
+    return json.dumps(signature, sort_keys=True)
+
+
+def signature_hash(signature: dict) -> str:
+    return hashlib.blake2b(canonical_signature(signature).encode("utf-8"), digest_size=16).hexdigest()
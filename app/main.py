@@ -1,9 +1,11 @@
+import hashlib
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from app.api.routes_activity import router as activity_router
@@ -20,6 +22,7 @@ from app.api.routes_exclusions import router as exclusions_router
 from app.core.config import APP_VERSION, settings as env_settings
 from app.core.db import init_db, SessionLocal
 from app.core.logging_utils import setup_logging, reconfigure_logging
+from app.services.activity_service import start_activity_writer, stop_activity_writer
 from app.services.settings_service import get_settings
 from app.worker.jobs import start_worker
 from app.worker.auto_scan import start_auto_scan_thread
@@ -27,7 +30,7 @@ from app.worker.auto_scan import start_auto_scan_thread
 BASE_DIR = Path(__file__).resolve().parent.parent
 UI_DIR = BASE_DIR / "ui"
 
-app = FastAPI(title="GalleryLoom", version=APP_VERSION)
+app = FastAPI(title="GalleryLoom", version=APP_VERSION, default_response_class=ORJSONResponse)
 
 
 def _ensure_dir(path: Path, allow_failure: bool = False) -> bool:
@@ -41,12 +44,17 @@ def _ensure_dir(path: Path, allow_failure: bool = False) -> bool:
         return False
 
 
-def _chown_if_requested(path: Path):
+def _prepare_dir(path: Path):
+    _ensure_dir(path)
     if env_settings.puid is None and env_settings.pgid is None:
         return
     uid = env_settings.puid if env_settings.puid is not None else -1
     gid = env_settings.pgid if env_settings.pgid is not None else -1
     try:
+        st = path.stat()
+        # persistent volumes usually already have the right owner; skip the chown then
+        if uid in (-1, st.st_uid) and gid in (-1, st.st_gid):
+            return
         os.chown(path, uid, gid)
     except PermissionError as exc:  # pragma: no cover - depends on platform
         logging.warning("Could not chown %s (permission error): %s", path, exc)
@@ -67,50 +75,69 @@ async def startup():
         if temp_override not in created_paths:
             created_paths.append(temp_override)
     for path in created_paths:
-        _ensure_dir(path)
-        _chown_if_requested(path)
+        _prepare_dir(path)
     _ensure_dir(Path(env_settings.duplicates_root), allow_failure=True)
     await init_db()
     async with SessionLocal() as session:
         saved_settings = await get_settings(session)
         if saved_settings.debug_logging != env_settings.debug_logging:
             reconfigure_logging(Path(env_settings.config_root), saved_settings.debug_logging)
+    start_activity_writer()
     start_worker()
     start_auto_scan_thread()
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_activity_writer()
+
+
 def _ui_file(name: str) -> Path:
     return UI_DIR / name
 
 
+@lru_cache(maxsize=None)
+def _ui_page(name: str) -> tuple[bytes, str]:
+    body = _ui_file(name).read_bytes()
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def _ui_response(request: Request, name: str) -> Response:
+    body, etag = _ui_page(name)
+    headers = {"etag": etag, "cache-control": "public, max-age=60"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
+
+
 @app.get("/")
-async def ui_root():
-    return FileResponse(_ui_file("index.html"))
+async def ui_root(request: Request):
+    return _ui_response(request, "index.html")
 
 
 @app.get("/sources")
-async def ui_sources():
-    return FileResponse(_ui_file("sources.html"))
+async def ui_sources(request: Request):
+    return _ui_response(request, "sources.html")
 
 
 @app.get("/logs")
-async def ui_logs():
-    return FileResponse(_ui_file("logs.html"))
+async def ui_logs(request: Request):
+    return _ui_response(request, "logs.html")
 
 
 @app.get("/duplicates")
-async def ui_duplicates():
-    return FileResponse(_ui_file("duplicates.html"))
+async def ui_duplicates(request: Request):
+    return _ui_response(request, "duplicates.html")
 
 
 @app.get("/galleries")
-async def ui_galleries():
-    return FileResponse(_ui_file("galleries.html"))
+async def ui_galleries(request: Request):
+    return _ui_response(request, "galleries.html")
 
 
 @app.get("/settings")
-async def ui_settings():
-    return FileResponse(_ui_file("settings.html"))
+async def ui_settings(request: Request):
+    return _ui_response(request, "settings.html")
 
 
 app.mount("/static", StaticFiles(directory=UI_DIR), name="static")
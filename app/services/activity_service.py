@@ -1,12 +1,15 @@
-import json
+import asyncio
 import logging
+import queue
 from typing import Any, Sequence
 
-from sqlalchemy import desc, select
+import orjson
+from sqlalchemy import Row, desc, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import models
-from app.worker.jobs import get_current_job_id
+from app.core.db import SessionLocal
+from app.worker.jobs import current_job_id
 
 logger = logging.getLogger("galleryloom")
 _LEVELS = {
@@ -17,22 +20,91 @@ _LEVELS = {
     "ERROR": logging.ERROR,
 }
 
+ACTIVITY_BATCH_SIZE = 200
+ACTIVITY_FLUSH_INTERVAL = 0.1
+
+# Rows come from the API loop and from the worker thread's own loops, so the buffer is a
+# thread-safe queue rather than an asyncio.Queue bound to one loop.
+_pending: "queue.SimpleQueue[dict[str, Any]]" = queue.SimpleQueue()
+_writer_task: asyncio.Task | None = None
+_flush_lock = asyncio.Lock()
+
+
+async def _insert_rows(session: AsyncSession, rows: list[dict[str, Any]]):
+    await session.execute(insert(models.Activity), rows)
+    await session.commit()
+
+
+def _drain(limit: int) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    while len(rows) < limit:
+        try:
+            rows.append(_pending.get_nowait())
+        except queue.Empty:
+            break
+    return rows
+
+
+async def flush_activity():
+    # serialized so a reader's flush also waits for a batch the writer already drained
+    async with _flush_lock:
+        while rows := _drain(ACTIVITY_BATCH_SIZE):
+            try:
+                async with SessionLocal() as session:
+                    await _insert_rows(session, rows)
+            except Exception:
+                logger.error("Failed to write %d activity rows", len(rows), exc_info=True)
+
+
+async def _writer_loop():
+    while True:
+        await asyncio.sleep(ACTIVITY_FLUSH_INTERVAL)
+        await flush_activity()
+
+
+def start_activity_writer():
+    global _writer_task
+    if _writer_task is None or _writer_task.done():
+        _writer_task = asyncio.get_running_loop().create_task(_writer_loop())
+
+
+async def stop_activity_writer():
+    global _writer_task
+    if _writer_task is not None:
+        _writer_task.cancel()
+        try:
+            await _writer_task
+        except asyncio.CancelledError:
+            pass
+        _writer_task = None
+    await flush_activity()
+
 
 async def log_activity(session: AsyncSession, level: str, message: str, payload: Any | None = None):
     payload_obj = payload or {}
     if not isinstance(payload_obj, dict):
         payload_obj = {"data": payload_obj}
-    job_id = payload_obj.get("job_id") or get_current_job_id()
+    job_id = payload_obj.get("job_id") or current_job_id.get()
     if job_id:
         payload_obj["job_id"] = job_id
-    payload_json = json.dumps(payload_obj)
-    entry = models.Activity(level=level.upper(), message=message, payload_json=payload_json)
-    session.add(entry)
-    await session.commit()
+    payload_json = orjson.dumps(payload_obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    row = {"level": level.upper(), "message": message, "payload_json": payload_json}
+    if _writer_task is None:
+        # no background writer (scripts, tests): write through the caller's session
+        await _insert_rows(session, [row])
+    else:
+        _pending.put(row)
     logger.log(_LEVELS.get(level.upper(), logging.INFO), "%s :: %s", message, payload_json)
 
 
-async def fetch_recent_activity(session: AsyncSession, limit: int = 100) -> Sequence[models.Activity]:
-    stmt = select(models.Activity).order_by(desc(models.Activity.ts)).limit(limit)
+async def fetch_recent_activity(session: AsyncSession, limit: int = 100) -> Sequence[Row]:
+    await flush_activity()
+    # plain column tuples: no ORM identity map or instance state for a read-only listing;
+    # ts has second resolution, so id keeps rows from the same second in insert order
+    stmt = (
+        select(models.Activity.ts, models.Activity.level, models.Activity.message, models.Activity.payload_json)
+        .order_by(desc(models.Activity.ts), desc(models.Activity.id))
+        .limit(limit)
+    )
     result = await session.execute(stmt)
-    return result.scalars().all()
+    return result.all()
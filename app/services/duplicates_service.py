@@ -1,28 +1,54 @@
-import json
+import os
+import threading
 from pathlib import Path
 from typing import Iterable, Set
 
+import orjson
+
 from app.core.config import settings as env_settings
 
+# acknowledged keys are read from disk once and then kept in memory; this process is
+# the only writer of the file
+_ack_cache: tuple[Path, Set[str]] | None = None
+_ack_lock = threading.Lock()
+
 
 def _ack_file() -> Path:
     return Path(env_settings.config_root) / "duplicates_ack.json"
 
 
-def load_acknowledged() -> Set[str]:
-    path = _ack_file()
+def _read_ack_file(path: Path) -> Set[str]:
     if not path.exists():
         return set()
     try:
-        data = json.loads(path.read_text())
+        data = orjson.loads(path.read_bytes())
         return set(data if isinstance(data, list) else [])
     except Exception:
         return set()
 
 
-def mark_acknowledged(keys: Iterable[str]) -> None:
-    existing = load_acknowledged()
-    existing.update(keys)
+def _cached_acks() -> Set[str]:
+    global _ack_cache
     path = _ack_file()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(sorted(existing)))
+    if _ack_cache is None or _ack_cache[0] != path:
+        _ack_cache = (path, _read_ack_file(path))
+    return _ack_cache[1]
+
+
+def load_acknowledged() -> Set[str]:
+    with _ack_lock:
+        return set(_cached_acks())
+
+
+def mark_acknowledged(keys: Iterable[str]) -> None:
+    with _ack_lock:
+        existing = _cached_acks()
+        new_keys = set(keys) - existing
+        if not new_keys:
+            return
+        path = _ack_file()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_bytes(orjson.dumps(sorted(existing | new_keys)))
+        os.replace(tmp, path)
+        existing.update(new_keys)
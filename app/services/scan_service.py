@@ -1,29 +1,43 @@
+import asyncio
 import errno
 import hashlib
 import logging
-import json
 import os
 import shutil
 import time
 import tempfile
+import threading
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import IO, Dict, Iterable, List, Optional, Sequence
 
+import orjson
 from rapidfuzz import fuzz
 from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.api.schemas import DiffItem, DiffResult, PlanAction, ScanResult, ScanSummary
 from app.core import models
 from app.core.config import settings as env_settings
+from app.core.signatures import signature_hash
 from app.services.activity_service import log_activity
 from app.services.settings_service import get_settings
 from app.services.status_service import set_status
 
 SIDECAR_EXTS = {".txt", ".json", ".xml", ".nfo"}
+RECORD_COMMIT_BATCH = 200  # record writes per commit during a scan
+# already-compressed formats gain nothing from deflate, so gallery zips store them as-is
+INCOMPRESSIBLE_EXTS = frozenset({"jpg", "jpeg", "jfif", "png", "webp", "gif", "avif", "heic", "heif", "jxl", "mp4", "mov"})
+# zlib releases the GIL while deflating, so gallery entries are read and compressed in parallel
+ZIP_WORKERS = min(8, os.cpu_count() or 1)
 _last_results: Dict[str, Optional[ScanResult]] = {"dryrun": None, "run": None}
 _warned_missing_duplicates = False
 logger = logging.getLogger("galleryloom.scan")
@@ -38,18 +52,33 @@ class GalleryCandidate:
     is_leaf: bool
 
 
-def _ext_in_list(path: Path, options: Iterable[str]) -> bool:
-    return path.suffix.lower().lstrip(".") in {ext.lower().lstrip(".") for ext in options}
+def _ext_set(options: Iterable[str]) -> frozenset[str]:
+    if isinstance(options, frozenset):
+        return options
+    return frozenset(ext.lower().lstrip(".") for ext in options)
 
 
+def _name_ext(name: str) -> str:
+    """Lowercased extension of a file name without the dot, matching ``Path.suffix`` rules."""
+    i = name.rfind(".")
+    return name[i + 1:].lower() if 0 < i < len(name) - 1 else ""
+
+
+def _has_ext(path: Path, exts: frozenset[str]) -> bool:
+    return _name_ext(path.name) in exts
+
+
+# The suffix is part of flattened output names already on disk, so the digest must stay sha1.
+@lru_cache(maxsize=4096)
 def _short_hash(value: str) -> str:
     return hashlib.sha1(value.encode("utf-8")).hexdigest()[:8]
 
 
-def _gallery_signature(images: List[Path]) -> dict:
+def _gallery_signature(images: List[Path], stats: Optional[List[os.stat_result]] = None) -> dict:
     if not images:
         return {"image_count": 0, "total_image_bytes": 0, "newest_mtime": 0}
-    stats = [p.stat() for p in images]
+    if stats is None:
+        stats = [p.stat() for p in images]
     return {
         "image_count": len(images),
         "total_image_bytes": sum(s.st_size for s in stats),
@@ -58,6 +87,7 @@ def _gallery_signature(images: List[Path]) -> dict:
 
 
 def _archive_signature(path: Path) -> dict:
+    """Stat-only fingerprint (no content read); stored records compare against exactly these keys."""
     stat = path.stat()
     return {"size": stat.st_size, "mtime": stat.st_mtime}
 
@@ -68,6 +98,73 @@ async def _get_record(session: AsyncSession, target_path: Path) -> models.Archiv
     return result.scalars().first()
 
 
+class _OutputIndex:
+    """Serves existence/size checks on output paths from one scandir per directory.
+
+    Paths the scan writes (and their parents) are marked changed and stat'ed directly afterwards.
+    """
+
+    def __init__(self):
+        self._listings: Dict[str, Dict[str, os.DirEntry]] = {}
+        self._changed: set[str] = set()
+
+    def _listing(self, directory: str) -> Dict[str, os.DirEntry]:
+        listing = self._listings.get(directory)
+        if listing is None:
+            try:
+                with os.scandir(directory) as it:
+                    listing = {entry.name: entry for entry in it}
+            except OSError:
+                listing = {}
+            self._listings[directory] = listing
+        return listing
+
+    def stat(self, path: Path) -> os.stat_result | None:
+        key = str(path)
+        try:
+            if key in self._changed:
+                return os.stat(key)
+            entry = self._listing(os.path.dirname(key)).get(os.path.basename(key))
+            return entry.stat() if entry is not None else None
+        except OSError:
+            return None
+
+    def exists(self, path: Path) -> bool:
+        return self.stat(path) is not None
+
+    def changed(self, path: Path):
+        for changed in (path, *path.parents):
+            self._changed.add(str(changed))
+
+
+def _paths_overlap(a: str, b: str) -> bool:
+    return a == b or a.startswith(b + os.sep) or b.startswith(a + os.sep)
+
+
+def _same_signature(record: models.ArchiveRecord | None, signature: dict) -> bool:
+    if not record or not record.signature_json:
+        return False
+    # records are written with orjson, so an unchanged candidate matches on text without a parse;
+    # older rows (json.dumps spacing) fall through to the value comparison
+    if record.signature_json == orjson.dumps(signature).decode():
+        return True
+    return orjson.loads(record.signature_json) == signature
+
+
+async def _load_records(session: AsyncSession) -> Dict[str, models.ArchiveRecord]:
+    """All output records keyed by target path, so a scan does one query instead of one per candidate."""
+    result = await session.execute(select(models.ArchiveRecord))
+    return {record.target_path: record for record in result.scalars()}
+
+
+async def _lookup_record(
+    session: AsyncSession, target_path: Path, records: Optional[Dict[str, models.ArchiveRecord]]
+) -> models.ArchiveRecord | None:
+    if records is None:
+        return await _get_record(session, target_path)
+    return records.get(str(target_path))
+
+
 async def _upsert_record(
     session: AsyncSession,
     target_path: Path,
@@ -75,42 +172,108 @@ async def _upsert_record(
     type_: str,
     signature: dict,
     virtual_target_path: Path | None = None,
+    records: Optional[Dict[str, models.ArchiveRecord]] = None,
+    now: datetime | None = None,
+    commit: bool = True,
 ) -> None:
-    now = datetime.utcnow()
-    existing = await _get_record(session, target_path)
+    now = now or datetime.utcnow()
+    existing = await _lookup_record(session, target_path, records)
     if existing:
         existing.source_path = str(source_path)
         existing.type = type_
-        existing.signature_json = json.dumps(signature)
+        existing.signature_json = orjson.dumps(signature).decode()
+        existing.signature_hash = signature_hash(signature)
         existing.virtual_target_path = str(virtual_target_path) if virtual_target_path else None
         existing.last_seen_at = now
         existing.updated_at = now
     else:
-        session.add(
-            models.ArchiveRecord(
-                target_path=str(target_path),
-                source_path=str(source_path),
-                type=type_,
-                signature_json=json.dumps(signature),
-                virtual_target_path=str(virtual_target_path) if virtual_target_path else None,
-                created_at=now,
-                updated_at=now,
-                last_seen_at=now,
-            )
+        record = models.ArchiveRecord(
+            target_path=str(target_path),
+            source_path=str(source_path),
+            type=type_,
+            signature_json=orjson.dumps(signature).decode(),
+            signature_hash=signature_hash(signature),
+            virtual_target_path=str(virtual_target_path) if virtual_target_path else None,
+            created_at=now,
+            updated_at=now,
+            last_seen_at=now,
         )
-    await session.commit()
+        session.add(record)
+        if records is not None:
+            records[record.target_path] = record
+    if commit:
+        await session.commit()
+
+
+def _record_values(
+    target_path: str, source_path: Path, type_: str, signature: dict, virtual_target_path: Path | None, now: datetime
+) -> dict:
+    return {
+        "target_path": target_path,
+        "source_path": str(source_path),
+        "type": type_,
+        "signature_json": orjson.dumps(signature).decode(),
+        "signature_hash": signature_hash(signature),
+        "virtual_target_path": str(virtual_target_path) if virtual_target_path else None,
+        "created_at": now,
+        "updated_at": now,
+        "last_seen_at": now,
+    }
+
+
+async def _upsert_record_rows(session: AsyncSession, rows: List[dict]):
+    """Write _record_values rows with one executemany INSERT .. ON CONFLICT(target_path) DO UPDATE."""
+    stmt = sqlite_insert(models.ArchiveRecord)
+    updated = [name for name in rows[0] if name not in {"target_path", "created_at"}]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.ArchiveRecord.target_path],
+        set_={name: stmt.excluded[name] for name in updated},
+    )
+    await session.execute(stmt, rows)
 
 
-async def _touch_record(session: AsyncSession, target_path: Path):
-    existing = await _get_record(session, target_path)
+async def _touch_record(
+    session: AsyncSession,
+    target_path: Path,
+    records: Optional[Dict[str, models.ArchiveRecord]] = None,
+    now: datetime | None = None,
+    commit: bool = True,
+):
+    existing = await _lookup_record(session, target_path, records)
     if existing:
-        existing.last_seen_at = datetime.utcnow()
-        await session.commit()
+        existing.last_seen_at = now or datetime.utcnow()
+        if commit:
+            await session.commit()
+
+
+# errors meaning copy_file_range cannot handle this pair of files (cross-fs on older kernels, unsupported fs)
+_COPY_RANGE_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM, errno.EBADF}
+_COPY_RANGE_CHUNK = 1 << 30
+
 
+def _copy_data(src: Path, dest: Path):
+    """Copy file contents with copy_file_range where available (reflink/server-side copy), else shutil.copyfile."""
+    if not hasattr(os, "copy_file_range"):
+        shutil.copyfile(src, dest)
+        return
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        copied = 0
+        try:
+            while True:
+                sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), _COPY_RANGE_CHUNK)
+                if sent == 0:
+                    return
+                copied += sent
+        except OSError as exc:
+            if copied or exc.errno not in _COPY_RANGE_FALLBACK_ERRNOS:
+                raise
+    shutil.copyfile(src, dest)
 
-def _copy_file(src: Path, dest: Path):
+
+def _copy_file(src: Path, dest: Path, make_parent: bool = True):
     try:
-        dest.parent.mkdir(parents=True, exist_ok=True)
+        if make_parent:
+            dest.parent.mkdir(parents=True, exist_ok=True)
         if env_settings.use_hardlinks:
             try:
                 os.link(src, dest)
@@ -118,7 +281,8 @@ def _copy_file(src: Path, dest: Path):
                 return
             except OSError:
                 logger.debug("Hardlink failed for %s -> %s, falling back to copy", src, dest)
-        shutil.copy2(src, dest)
+        _copy_data(src, dest)
+        shutil.copystat(src, dest)
         logger.debug("Copied %s -> %s", src, dest)
     except Exception:
         logger.debug("Copy failed for %s -> %s", src, dest, exc_info=True)
@@ -145,45 +309,184 @@ def _fsync_path(path: Path):
         logger.debug("fsync skipped for %s", path, exc_info=True)
 
 
-def _create_temp_zip_path(target_zip: Path) -> tuple[Path, bool]:
+_replace = os.replace  # zip finalization goes through this so tests can fail it without patching os
+_ZIP_BUFFER = 1 << 20  # entry headers and the central directory are many small writes; batch them
+
+
+def _temp_zip_in(directory: Path, target_zip: Path) -> IO[bytes]:
+    return tempfile.NamedTemporaryFile(
+        delete=False,
+        dir=directory,
+        prefix=f"{target_zip.stem}_",
+        suffix=".zip.tmp",
+        buffering=_ZIP_BUFFER,
+    )
+
+
+def _open_temp_zip(target_zip: Path) -> tuple[IO[bytes], bool]:
+    """Open the temp file a zip is written into; the handle is written, fsynced and closed by the caller."""
     target_dir = target_zip.parent
     try:
-        target_dir.mkdir(parents=True, exist_ok=True)
-        handle = tempfile.NamedTemporaryFile(
-            delete=False,
-            dir=target_dir,
-            prefix=f"{target_zip.stem}_",
-            suffix=".zip.tmp",
-        )
-        handle.close()
-        return Path(handle.name), True
+        try:
+            return _temp_zip_in(target_dir, target_zip), True
+        except FileNotFoundError:
+            # output dirs mostly exist already; only create one when the open finds it missing
+            target_dir.mkdir(parents=True, exist_ok=True)
+            return _temp_zip_in(target_dir, target_zip), True
     except Exception:
         logger.debug("Unable to create temp in target dir for %s, falling back to tmp root", target_zip, exc_info=True)
     tmp_root = Path(env_settings.temp_dir or env_settings.tmp_root)
     tmp_root.mkdir(parents=True, exist_ok=True)
-    handle = tempfile.NamedTemporaryFile(
-        delete=False,
-        dir=tmp_root,
-        prefix=f"{target_zip.stem}_",
-        suffix=".zip.tmp",
-    )
-    handle.close()
-    return Path(handle.name), False
+    return _temp_zip_in(tmp_root, target_zip), False
+
+
+class _GalleryZipFile(zipfile.ZipFile):
+    """ZipFile that can append entries whose payload was compressed ahead of time."""
+
+    def write_compressed(
+        self, zinfo: zipfile.ZipInfo, payload: bytes | None, crc: int, file_size: int, source: Path | None = None
+    ):
+        """Append an entry; a ``None`` payload streams the stored bytes straight from ``source``."""
+        zinfo.flag_bits = 0
+        zinfo.CRC = crc
+        zinfo.file_size = file_size
+        zinfo.compress_size = len(payload) if payload is not None else file_size
+        zip64 = max(file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+        if zip64 and not self._allowZip64:
+            raise zipfile.LargeZipFile("Filesize would require ZIP64 extensions")
+        with self._lock:
+            if self._writing:
+                raise ValueError("Can't write to ZIP archive while an open writing handle exists.")
+            self.fp.seek(self.start_dir)
+            zinfo.header_offset = self.fp.tell()
+            self._writecheck(zinfo)
+            self._didModify = True
+            self.fp.write(zinfo.FileHeader(zip64))
+            if payload is None:
+                _append_file(self.fp, source, file_size)
+            else:
+                self.fp.write(payload)
+            self.start_dir = self.fp.tell()
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
+
+
+_STREAM_CHUNK = 1 << 20
+_stream_buffers = threading.local()
+
+
+def _stream_buffer() -> memoryview:
+    # one chunk buffer per zip pool thread, reused by every entry it streams
+    buf = getattr(_stream_buffers, "buf", None)
+    if buf is None:
+        buf = _stream_buffers.buf = memoryview(bytearray(_STREAM_CHUNK))
+    return buf
+
+
+def _append_file(fp, source: Path, size: int):
+    """Copy ``size`` bytes of source to the end of fp, in the kernel via sendfile when possible."""
+    fp.flush()
+    start = fp.tell()
+    sent = 0
+    with open(source, "rb") as src:
+        try:
+            while sent < size:
+                count = os.sendfile(fp.fileno(), src.fileno(), sent, size - sent)
+                if count == 0:
+                    break
+                sent += count
+        except OSError as exc:
+            if exc.errno not in {errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP}:
+                raise
+        # resync the buffered writer with the descriptor, then finish any remainder in user space
+        fp.seek(start + sent)
+        src.seek(sent)
+        buf = _stream_buffer()
+        while sent < size:
+            count = src.readinto(buf[: min(_STREAM_CHUNK, size - sent)])
+            if not count:
+                break
+            fp.write(buf[:count])
+            sent += count
+    if sent != size:
+        raise OSError(errno.EIO, f"{source} changed size while being zipped")
+
+
+def _file_crc(path: Path) -> tuple[int, int]:
+    crc = 0
+    size = 0
+    buf = _stream_buffer()
+    with open(path, "rb", buffering=0) as handle:
+        while count := handle.readinto(buf):
+            crc = zlib.crc32(buf[:count], crc)
+            size += count
+    return crc, size
+
+
+def _compress_entry(path: Path, compress_type: int, level: int) -> tuple[bytes | None, int, int]:
+    if compress_type == zipfile.ZIP_STORED and env_settings.zip_fast_io and hasattr(os, "sendfile"):
+        return (None, *_file_crc(path))
+    data = path.read_bytes()
+    crc = zlib.crc32(data)
+    if compress_type == zipfile.ZIP_STORED:
+        return data, crc, len(data)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(), crc, len(data)
+
+
+@lru_cache(maxsize=1)
+def _zip_pool() -> ThreadPoolExecutor:
+    # shared by concurrent gallery writes: caps entry reads/compression at ZIP_WORKERS overall
+    # and avoids starting a fresh pool per gallery
+    return ThreadPoolExecutor(max_workers=ZIP_WORKERS, thread_name_prefix="gloom-zip")
+
+
+def _write_zip_entries(zf: _GalleryZipFile, source_dir: Path, image_files: List[Path]):
+    level = env_settings.gallery_zip_level
+    relative = _relative_to(source_dir)
+    pool = _zip_pool()
+    # keep a bounded window in flight so large galleries are not buffered whole
+    pending: deque = deque()
+    try:
+        for file in image_files:
+            try:
+                arcname = str(relative(file))
+            except ValueError:
+                arcname = file.name
+            zinfo = zipfile.ZipInfo.from_file(file, arcname=arcname)
+            zinfo.compress_type = zipfile.ZIP_STORED if _has_ext(file, INCOMPRESSIBLE_EXTS) else zipfile.ZIP_DEFLATED
+            pending.append((zinfo, file, pool.submit(_compress_entry, file, zinfo.compress_type, level)))
+            if len(pending) >= ZIP_WORKERS * 2:
+                zinfo, source, future = pending.popleft()
+                zf.write_compressed(zinfo, *future.result(), source=source)
+        while pending:
+            zinfo, source, future = pending.popleft()
+            zf.write_compressed(zinfo, *future.result(), source=source)
+    finally:
+        # a failed entry must not leave this gallery's reads running on the shared pool
+        for _, _, future in pending:
+            future.cancel()
 
 
 def _write_zip(source_dir: Path, image_files: List[Path], target_zip: Path):
     temp_zip: Path | None = None
     partial_path: Path | None = None
     try:
-        temp_zip, _ = _create_temp_zip_path(target_zip)
-        with zipfile.ZipFile(temp_zip, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for file in image_files:
-                arcname = file.relative_to(source_dir) if file.is_relative_to(source_dir) else file.name
-                zf.write(file, arcname=str(arcname))
-        target_zip.parent.mkdir(parents=True, exist_ok=True)
-        _fsync_path(temp_zip)
+        handle, in_target = _open_temp_zip(target_zip)
+        temp_zip = Path(handle.name)
+        # write through the handle mkstemp opened instead of closing and reopening the path
+        with handle:
+            with _GalleryZipFile(handle.file, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                _write_zip_entries(zf, source_dir, image_files)
+            handle.flush()
+            try:
+                os.fsync(handle.fileno())
+            except OSError:
+                logger.debug("fsync skipped for %s", temp_zip, exc_info=True)
+        if not in_target:
+            target_zip.parent.mkdir(parents=True, exist_ok=True)
         try:
-            os.replace(temp_zip, target_zip)
+            _replace(temp_zip, target_zip)
             logger.debug("Wrote zip %s from %s files (%s)", target_zip, len(image_files), source_dir)
             return
         except OSError as exc:
@@ -191,9 +494,10 @@ def _write_zip(source_dir: Path, image_files: List[Path], target_zip: Path):
                 raise
         partial_path = target_zip.with_suffix(f"{target_zip.suffix}.partial")
         _safe_unlink(partial_path)
-        shutil.copy2(temp_zip, partial_path)
+        _copy_data(temp_zip, partial_path)
+        shutil.copymode(temp_zip, partial_path)  # same mode as a zip renamed into place
         _fsync_path(partial_path)
-        os.replace(partial_path, target_zip)
+        _replace(partial_path, target_zip)
         logger.debug("Wrote zip %s with cross-device fallback (%s)", target_zip, temp_zip.parent)
     except Exception:
         logger.debug("Zip write failed for %s", target_zip, exc_info=True)
@@ -205,57 +509,139 @@ def _write_zip(source_dir: Path, image_files: List[Path], target_zip: Path):
             _safe_unlink(partial_path)
 
 
-def _gather_gallery_files(path: Path, image_exts: Iterable[str], recursive: bool) -> List[Path]:
-    if not path.exists():
-        return []
-    files: List[Path] = []
-    if recursive:
-        for root, dirs, filenames in os.walk(path):
-            dirs.sort()
-            filenames.sort()
-            for name in filenames:
-                candidate = Path(root) / name
-                if candidate.is_file() and _ext_in_list(candidate, image_exts):
-                    files.append(candidate)
-    else:
-        for candidate in sorted(path.iterdir()):
-            if candidate.is_file() and _ext_in_list(candidate, image_exts):
-                files.append(candidate)
-    return files
+def _scan_sorted(path: str) -> tuple[List[os.DirEntry], List[os.DirEntry]]:
+    """Name-sorted (dirs, non-dirs) of one directory; unreadable directories are empty, like os.walk."""
+    dirs: List[os.DirEntry] = []
+    files: List[os.DirEntry] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry)
+    except OSError:
+        return [], []
+    dirs.sort(key=lambda e: e.name)
+    files.sort(key=lambda e: e.name)
+    return dirs, files
+
+
+def _walk_entries(top: str, topdown: bool = True):
+    """os.walk over scandir entries: yields (dirpath, dir entries, file entries), never following dir symlinks."""
+    dirs, files = _scan_sorted(top)
+    if topdown:
+        yield top, dirs, files
+    for entry in dirs:
+        try:
+            if entry.is_symlink():
+                continue
+        except OSError:
+            continue
+        yield from _walk_entries(entry.path, topdown)
+    if not topdown:
+        yield top, dirs, files
 
 
-def _gather_sidecars(path: Path, recursive: bool) -> List[Path]:
+def _entry_is_file(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def _gather_entries(path: Path, recursive: bool, wanted) -> List[os.DirEntry]:
     if not path.exists():
         return []
-    files: List[Path] = []
     if recursive:
-        for root, dirs, filenames in os.walk(path):
-            dirs.sort()
-            filenames.sort()
-            for name in filenames:
-                candidate = Path(root) / name
-                if candidate.is_file() and candidate.suffix.lower() in SIDECAR_EXTS:
-                    files.append(candidate)
+        walk = _walk_entries(str(path))
     else:
-        for candidate in sorted(path.iterdir()):
-            if candidate.is_file() and candidate.suffix.lower() in SIDECAR_EXTS:
-                files.append(candidate)
-    return files
+        walk = [(str(path), *_scan_sorted(str(path)))]
+    return [entry for _, _, entries in walk for entry in entries if wanted(entry.name) and _entry_is_file(entry)]
+
+
+def _gather_gallery_files(path: Path, image_exts: Iterable[str], recursive: bool) -> List[Path]:
+    exts = _ext_set(image_exts)
+    return [Path(entry.path) for entry in _gather_entries(path, recursive, lambda name: _name_ext(name) in exts)]
+
 
+def _gather_sidecars(path: Path, recursive: bool) -> List[Path]:
+    entries = _gather_entries(path, recursive, lambda name: f".{_name_ext(name)}" in SIDECAR_EXTS)
+    return [Path(entry.path) for entry in entries]
+
+
+def _iter_archives(base_path: Path, archive_exts: Iterable[str]) -> List[Path]:
+    """Archives under base_path in full-path string order, without listing the whole tree."""
+    exts = _ext_set(archive_exts)
+    found: List[Path] = []
+
+    def visit(directory: str):
+        dirs, files = _scan_sorted(directory)
+        # a trailing "/" on directory names reproduces sorting by the full path string
+        items = [(entry.name + "/", entry, True) for entry in dirs] + [(entry.name, entry, False) for entry in files]
+        items.sort(key=lambda item: item[0])
+        for _, entry, is_dir in items:
+            if is_dir:
+                if not entry.is_symlink():
+                    visit(entry.path)
+            elif _name_ext(entry.name) in exts and _entry_is_file(entry):
+                found.append(Path(entry.path))
+
+    visit(str(base_path))
+    return found
+
+
+def _name_similarity(a: str, b: str) -> float:
+    # the compared names are nearly always identical, so skip the edit-distance kernel for them
+    if a == b:
+        return 1.0
+    return float(fuzz.ratio(a, b)) / 100.0
+
+
+def _make_virtual_resolver(replicate_nesting: bool):
+    """Output path for a data-root-relative path string: nested as is, else top-level dir + name."""
+    output_root = Path(env_settings.output_root)
+    # entries of one source directory share a virtual output directory, so resolve it once per parent
+    virtual_dirs: Dict[str, Path] = {}
+
+    def virtual_target_for(rel_str: str) -> Path:
+        parent, _, name = rel_str.rpartition(os.sep)
+        virtual_dir = virtual_dirs.get(parent)
+        if virtual_dir is None:
+            if replicate_nesting:
+                virtual_dir = output_root / parent if parent else output_root
+            else:
+                virtual_dir = output_root / parent.split(os.sep, 1)[0] if parent else output_root
+            virtual_dirs[parent] = virtual_dir
+        return virtual_dir / name
+
+    return virtual_target_for
+
+
+def _make_resolver(replicate_nesting: bool, flatten_enabled: bool, flatten_map: Dict[str, str]):
+    """Output path resolver with the scan-constant settings bound once; returns (physical, virtual) targets."""
+    output_root = Path(env_settings.output_root)
+    virtual_target_for = _make_virtual_resolver(replicate_nesting)
+
+    def resolve_nested(rel_file: Path) -> tuple[Path, Path]:
+        virtual_target = virtual_target_for(str(rel_file))
+        return virtual_target, virtual_target
 
-def _iter_archives(base_path: Path, archive_exts: Iterable[str]) -> Iterable[Path]:
-    for path in sorted(base_path.rglob("*"), key=lambda p: str(p)):
-        if path.is_file() and _ext_in_list(path, archive_exts):
-            yield path
+    if not flatten_enabled:
+        return resolve_nested
 
+    def resolve_flat(rel_file: Path) -> tuple[Path, Path]:
+        rel_str = str(rel_file)
+        virtual_target = virtual_target_for(rel_str)
+        base_name = rel_file.name
+        recorded = flatten_map.get(base_name)
+        if recorded and recorded != rel_str:
+            base_name = f"{rel_file.stem}__{_short_hash(rel_str)}{rel_file.suffix}"
+        flatten_map.setdefault(base_name, rel_str)
+        return output_root / base_name, virtual_target
 
-def _virtual_relpath(rel_path: Path, replicate_nesting: bool) -> Path:
-    if replicate_nesting:
-        return rel_path
-    if len(rel_path.parts) > 1:
-        top = rel_path.parts[0]
-        return Path(top) / rel_path.name
-    return Path(rel_path.name)
+    return resolve_flat
 
 
 def _resolve_output_file(
@@ -264,18 +650,7 @@ def _resolve_output_file(
     flatten_enabled: bool,
     flatten_map: Dict[str, str],
 ) -> tuple[Path, Path]:
-    virtual_rel = _virtual_relpath(rel_file, replicate_nesting)
-    virtual_target = Path(env_settings.output_root) / virtual_rel
-    if not flatten_enabled:
-        return virtual_target, virtual_target
-
-    base_name = rel_file.name
-    recorded = flatten_map.get(base_name)
-    if recorded and recorded != str(rel_file):
-        base_name = f"{rel_file.stem}__{_short_hash(str(rel_file))}{rel_file.suffix}"
-    flatten_map.setdefault(base_name, str(rel_file))
-    physical = Path(env_settings.output_root) / base_name
-    return physical, virtual_target
+    return _make_resolver(replicate_nesting, flatten_enabled, flatten_map)(rel_file)
 
 
 def _append_reason(summary: ScanSummary, reason: str | None):
@@ -329,6 +704,33 @@ def _register_action(action: PlanAction, summary: ScanSummary, actions: List[Pla
     actions.append(action)
 
 
+def _exclusion_matcher(exclusions: Iterable[Path]):
+    """Precomputed equivalent of ``any(path.is_relative_to(exc) for exc in exclusions)``."""
+    exact = frozenset(str(exc) for exc in exclusions)
+    if "." in exact:
+        return lambda path: True
+    prefixes = tuple(f"{exc}{os.sep}" for exc in exact)
+
+    def is_excluded(path: Path) -> bool:
+        value = str(path)
+        return value in exact or value.startswith(prefixes)
+
+    return is_excluded
+
+
+def _relative_to(root: Path):
+    """Fast ``path.relative_to(root)`` by string prefix for paths built under root."""
+    prefix = str(root).rstrip(os.sep) + os.sep
+
+    def relative(path: Path) -> Path:
+        value = str(path)
+        if value.startswith(prefix):
+            return Path(value[len(prefix):])
+        return path.relative_to(root)
+
+    return relative
+
+
 def _safe_is_relative_to(path: Path, base: Path) -> bool:
     try:
         path.relative_to(base)
@@ -337,58 +739,118 @@ def _safe_is_relative_to(path: Path, base: Path) -> bool:
         return False
 
 
-def _discover_galleries(base_path: Path, data_root: Path, settings) -> tuple[List[GalleryCandidate], List[PlanAction], Sequence[Path]]:
+@dataclass
+class _DirInfo:
+    direct_images: int
+    total_images: int
+    is_leaf: bool
+    image_entries: List[os.DirEntry]
+    children: List[Path]
+
+
+def _subtree_entries(path: Path, dir_meta: Dict[Path, _DirInfo]) -> List[os.DirEntry]:
+    """Images of a directory and its walked subdirectories, in the order a top-down walk visits them."""
+    info = dir_meta[path]
+    entries = list(info.image_entries)
+    for child in info.children:
+        entries.extend(_subtree_entries(child, dir_meta))
+    return entries
+
+
+# slack for coarse filesystem timestamps when trusting directory mtimes
+_DIR_MTIME_SLACK = 2.0
+
+
+def _known_gallery_signatures(records: Dict[str, models.ArchiveRecord]) -> Dict[str, tuple[str, float]]:
+    """Most recently verified signature JSON and its last_seen epoch, per gallery source path."""
+    known: Dict[str, tuple[str, float]] = {}
+    for record in records.values():
+        if record.type not in {"galleryzip", "foldercopy"} or not record.signature_json or record.last_seen_at is None:
+            continue
+        seen = record.last_seen_at.replace(tzinfo=timezone.utc).timestamp()
+        current = known.get(record.source_path)
+        if current is None or seen > current[1]:
+            known[record.source_path] = (record.signature_json, seen)
+    return known
+
+
+def _unchanged_signature(path: Path, image_count: int, known: Dict[str, tuple[str, float]]) -> dict | None:
+    """Stored signature of a gallery whose directory has not changed since it was last verified.
+
+    Directory mtimes only move when entries are added, removed or renamed, so in-place image
+    edits go unnoticed; callers only use this when GLOOM_TRUST_DIR_MTIME is enabled.
+    """
+    entry = known.get(str(path))
+    if entry is None:
+        return None
+    signature_json, seen = entry
+    try:
+        if os.stat(path).st_mtime > seen - _DIR_MTIME_SLACK:
+            return None
+    except OSError:
+        return None
+    signature = orjson.loads(signature_json)
+    return signature if signature.get("image_count") == image_count else None
+
+
+def _discover_galleries(
+    base_path: Path,
+    data_root: Path,
+    settings,
+    known_signatures: Optional[Dict[str, tuple[str, float]]] = None,
+) -> tuple[List[GalleryCandidate], List[PlanAction], Sequence[Path]]:
     if not base_path.exists():
         return [], [], []
 
-    dir_meta: Dict[Path, Dict[str, int | bool]] = {}
-    for root, dirs, files in os.walk(base_path, topdown=False):
-        dirs.sort()
-        files.sort()
-        current = Path(root)
-        direct_images = [f for f in files if _ext_in_list(Path(f), settings.image_extensions)]
-        total_images = len(direct_images)
-        for d in dirs:
-            child = current / d
-            child_info = dir_meta.get(child)
-            if child_info:
-                total_images += int(child_info["total_images"])
-        dir_meta[current] = {
-            "direct_images": len(direct_images),
-            "total_images": total_images,
-            "is_leaf": len(dirs) == 0,
-        }
+    dir_meta: Dict[Path, _DirInfo] = {}
+    for root, dirs, files in _walk_entries(str(base_path), topdown=False):
+        direct_images = [e for e in files if _name_ext(e.name) in settings.image_ext_set]
+        children = [child for child in (Path(d.path) for d in dirs) if child in dir_meta]
+        dir_meta[Path(root)] = _DirInfo(
+            direct_images=len(direct_images),
+            total_images=len(direct_images) + sum(dir_meta[child].total_images for child in children),
+            is_leaf=len(dirs) == 0,
+            image_entries=[e for e in direct_images if _entry_is_file(e)],
+            children=children,
+        )
 
     galleries: List[GalleryCandidate] = []
     skips: List[PlanAction] = []
+    to_data_rel = _relative_to(data_root)
     for path in sorted(dir_meta.keys(), key=lambda p: str(p)):
         info = dir_meta[path]
-        rel_dir = path.relative_to(data_root)
-        direct_count = int(info["direct_images"])
-        total_images = int(info["total_images"])
+        rel_dir = to_data_rel(path)
+        direct_count = info.direct_images
+        total_images = info.total_images
         qualifies = False
         if direct_count >= settings.min_images_to_be_gallery:
             qualifies = True
-        elif settings.leaf_only and info["is_leaf"] and direct_count > 0:
+        elif settings.leaf_only and info.is_leaf and direct_count > 0:
             qualifies = True
         elif (not settings.leaf_only) and settings.consider_images_in_subfolders and total_images >= settings.min_images_to_be_gallery:
             qualifies = True
 
         if qualifies:
-            images = _gather_gallery_files(path, settings.image_extensions, settings.consider_images_in_subfolders)
-            signature = _gallery_signature(images)
+            # the walk already listed every image, so galleries are built without rescanning
+            entries = _subtree_entries(path, dir_meta) if settings.consider_images_in_subfolders else info.image_entries
+            images = [Path(entry.path) for entry in entries]
+            signature = None
+            if known_signatures and not settings.consider_images_in_subfolders:
+                signature = _unchanged_signature(path, len(entries), known_signatures)
+            if signature is None:
+                signature = _gallery_signature(images, [entry.stat() for entry in entries])
             galleries.append(
                 GalleryCandidate(
                     path=path,
                     rel_dir=rel_dir,
                     images=images,
                     signature=signature,
-                    is_leaf=bool(info["is_leaf"]),
+                    is_leaf=info.is_leaf,
                 )
             )
         else:
             reason_code = None
-            if direct_count == 0 and info["is_leaf"]:
+            if direct_count == 0 and info.is_leaf:
                 reason_code = "SKIP_NO_IMAGES"
             elif direct_count > 0 and direct_count < settings.min_images_to_be_gallery:
                 reason_code = "SKIP_BELOW_MIN_IMAGES"
@@ -411,7 +873,7 @@ def _discover_galleries(base_path: Path, data_root: Path, settings) -> tuple[Lis
         parent = gal_path.parent
         while _safe_is_relative_to(parent, base_path):
             info = dir_meta.get(parent)
-            if info and int(info["direct_images"]) == 0:
+            if info and info.direct_images == 0:
                 container_dirs.add(parent)
             if parent == base_path:
                 break
@@ -428,10 +890,15 @@ def _discover_galleries(base_path: Path, data_root: Path, settings) -> tuple[Lis
 
 
 def _copy_folder_contents(source_dir: Path, files: List[Path], sidecars: List[Path], target_dir: Path):
+    relative = _relative_to(source_dir)
+    made_dirs: set[Path] = set()
     for file in files + sidecars:
-        rel = file.relative_to(source_dir)
-        dest = target_dir / rel
-        _copy_file(file, dest)
+        dest = target_dir / relative(file)
+        # most files share a directory; create each one once instead of a mkdir per file
+        if dest.parent not in made_dirs:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            made_dirs.add(dest.parent)
+        _copy_file(file, dest, make_parent=False)
     logger.debug("Copied folder contents from %s to %s (files=%d sidecars=%d)", source_dir, target_dir, len(files), len(sidecars))
 
 
@@ -443,6 +910,9 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
     settings = await get_settings(session)
     output_modes = {mode.strip() for mode in settings.output_mode.split("+")}
     process_galleries = settings.zip_galleries or ("foldercopy" in output_modes)
+    # per-gallery outputs in a fixed order, and whether container dirs are created, are scan constants
+    modes_to_apply = [mode for mode in ("zip", "foldercopy") if mode in output_modes]
+    ensure_containers = (settings.replicate_nesting and not settings.lanraragi_flatten) or ("foldercopy" in output_modes)
     summary = ScanSummary()
     actions: List[PlanAction] = []
     completed_ops = 0
@@ -458,6 +928,87 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
         completed_ops += 1
         _update_scan_status(completed_ops, planned_ops, message=message, dry_run=dry_run)
 
+    # record writes share one timestamp and are committed in batches rather than per file;
+    # written records go out as one upsert per batch instead of row-at-a-time ORM inserts
+    scan_now = datetime.utcnow()
+    records: Dict[str, models.ArchiveRecord] = {}
+    outputs = _OutputIndex()
+    pending_records = 0
+    pending_upserts: Dict[str, dict] = {}
+
+    async def _commit_records(force: bool = False):
+        nonlocal pending_records
+        if pending_records and (force or pending_records >= RECORD_COMMIT_BATCH):
+            if pending_upserts:
+                await _upsert_record_rows(session, list(pending_upserts.values()))
+                pending_upserts.clear()
+            await session.commit()
+            pending_records = 0
+
+    async def _save_record(target_path: Path, source_path: Path, type_: str, signature: dict, virtual_target_path: Path | None):
+        nonlocal pending_records
+        outputs.changed(target_path)
+        key = str(target_path)
+        values = _record_values(key, source_path, type_, signature, virtual_target_path, scan_now)
+        pending_upserts[key] = values
+        record = records.get(key)
+        if record is None:
+            # stand-in (not added to the session) so later lookups in this scan see the write
+            records[key] = models.ArchiveRecord(**values)
+        else:
+            for name, value in values.items():
+                if name != "created_at":
+                    set_committed_value(record, name, value)
+        pending_records += 1
+        await _commit_records()
+
+    async def _seen_record(target_path: Path):
+        nonlocal pending_records
+        await _touch_record(session, target_path, records, now=scan_now, commit=False)
+        pending_records += 1
+        await _commit_records()
+
+    # archive copies and gallery writes run on worker threads, a few at a time; planning stays
+    # serial and writes are finished in submission order so records and activity keep the scan order
+    pending_writes: deque = deque()
+
+    async def _finish_write():
+        future, target, source_path, type_, signature, virtual_target, message, activity, payload = pending_writes.popleft()
+        await future
+        _complete_op(message)
+        await _save_record(target, source_path, type_, signature, virtual_target)
+        await log_activity(session, "INFO", activity, payload)
+
+    async def _queue_write(
+        write,
+        args: tuple,
+        target: Path,
+        source_path: Path,
+        type_: str,
+        signature: dict,
+        virtual_target: Path,
+        message: str,
+        activity: str,
+        action: PlanAction,
+    ):
+        _plan_op(message)
+        future = asyncio.ensure_future(asyncio.to_thread(write, *args))
+        pending_writes.append(
+            (future, target, source_path, type_, signature, virtual_target, message, activity, action.model_dump())
+        )
+        if len(pending_writes) >= env_settings.copy_workers:
+            await _finish_write()
+
+    async def _drain_writes():
+        while pending_writes:
+            await _finish_write()
+
+    async def _settle(target: Path):
+        # a queued write into, or around, this output must land before it is checked or written
+        key = str(target)
+        if any(_paths_overlap(key, str(pending[1])) for pending in pending_writes):
+            await _drain_writes()
+
     logger.debug(
         "Starting scan dry_run=%s output_modes=%s settings=%s",
         dry_run,
@@ -470,12 +1021,18 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
         result = await session.execute(select(models.Source).where(models.Source.enabled == True))  # noqa: E712
         sources = sorted(result.scalars().all(), key=lambda s: s.path)
         exclusions_result = await session.execute(select(models.Exclusion))
-        exclusions = [Path(ex.path) for ex in exclusions_result.scalars().all()]
+        is_excluded = _exclusion_matcher(Path(ex.path) for ex in exclusions_result.scalars().all())
+        records.update(await _load_records(session))
+        known_signatures = _known_gallery_signatures(records) if env_settings.trust_dir_mtime else None
 
         data_root = Path(env_settings.data_root)
+        to_data_rel = _relative_to(data_root)
         duplicates_root = Path(env_settings.duplicates_root)
         duplicates_available = duplicates_root.exists() and duplicates_root.is_dir() and os.access(duplicates_root, os.W_OK)
         flatten_name_map: Dict[str, str] = {}
+        resolve_output = _make_resolver(settings.replicate_nesting, settings.lanraragi_flatten, flatten_name_map)
+        output_path_for = _make_virtual_resolver(settings.replicate_nesting)
+        extension = settings.archive_extension_for_galleries.lstrip(".")
 
         global _warned_missing_duplicates
         if settings.duplicates_enabled and not duplicates_available and not _warned_missing_duplicates:
@@ -498,19 +1055,14 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
 
             # process archives
             if source.scan_mode != "folders_only":
-                for archive_path in _iter_archives(base_path, settings.archive_extensions):
-                    rel_path = archive_path.relative_to(data_root)
-                    if any(rel_path.is_relative_to(exc) for exc in exclusions):
+                for archive_path in _iter_archives(base_path, settings.archive_ext_set):
+                    rel_path = to_data_rel(archive_path)
+                    if is_excluded(rel_path):
                         logger.debug("Skipping excluded archive %s", rel_path)
                         continue
-                    physical_target, virtual_target = _resolve_output_file(
-                        rel_path,
-                        settings.replicate_nesting,
-                        settings.lanraragi_flatten,
-                        flatten_name_map,
-                    )
+                    physical_target, virtual_target = resolve_output(rel_path)
                     signature = _archive_signature(archive_path)
-                    existing_record = await _get_record(session, physical_target)
+                    existing_record = records.get(str(physical_target))
                     action = PlanAction(
                         action="copy_archive",
                         type="archive",
@@ -524,25 +1076,25 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
                         bytes=signature["size"],
                     )
 
-                    if physical_target.exists():
-                        is_same = existing_record and existing_record.signature_json and json.loads(existing_record.signature_json) == signature
+                    if outputs.exists(physical_target):
+                        is_same = _same_signature(existing_record, signature)
                         if is_same:
                             action.decision = "SKIP"
                             action.reason = "SKIP_EXISTING_UNCHANGED"
                             action.reason_code = "SKIP_EXISTING_UNCHANGED"
                             if not dry_run:
                                 await log_activity(session, "INFO", "Archive unchanged, skipping", action.model_dump())
-                                await _touch_record(session, physical_target)
+                                await _seen_record(physical_target)
                             _register_action(action, summary, actions)
                             continue
 
-                        if physical_target.stat().st_size == signature["size"]:
+                        if outputs.stat(physical_target).st_size == signature["size"]:
                             action.decision = "SKIP"
                             action.reason = "SKIP_DUPLICATE_SAME_SIZE"
                             action.reason_code = "SKIP_DUPLICATE_SAME_SIZE"
                             if not dry_run:
                                 await log_activity(session, "INFO", "Archive duplicate size, skipping", action.model_dump())
-                                await _touch_record(session, physical_target)
+                                await _seen_record(physical_target)
                             _register_action(action, summary, actions)
                             continue
 
@@ -560,34 +1112,49 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
                             action.reason = "SKIP_OUTPUT_CONFLICT"
                             action.reason_code = "SKIP_OUTPUT_CONFLICT"
                         if not dry_run:
-                            _plan_op("Copying archive duplicate")
-                            _copy_file(archive_path, alt_target)
-                            _complete_op("Copying archive duplicate")
-                            await _upsert_record(session, alt_target, archive_path, "archive", signature, virtual_target_path=virtual_target)
-                            await log_activity(session, "INFO", "Archive duplicated", action.model_dump())
+                            await _queue_write(
+                                _copy_file,
+                                (archive_path, alt_target),
+                                alt_target,
+                                archive_path,
+                                "archive",
+                                signature,
+                                virtual_target,
+                                "Copying archive duplicate",
+                                "Archive duplicated",
+                                action,
+                            )
                         _register_action(action, summary, actions)
                         continue
 
                     if not dry_run:
-                        _plan_op("Copying archive")
-                        _copy_file(archive_path, physical_target)
-                        _complete_op("Copying archive")
-                        await _upsert_record(session, physical_target, archive_path, "archive", signature, virtual_target_path=virtual_target)
-                        await log_activity(session, "INFO", "Archive copied", action.model_dump())
+                        await _queue_write(
+                            _copy_file,
+                            (archive_path, physical_target),
+                            physical_target,
+                            archive_path,
+                            "archive",
+                            signature,
+                            virtual_target,
+                            "Copying archive",
+                            "Archive copied",
+                            action,
+                        )
                     _register_action(action, summary, actions)
+                await _drain_writes()
 
             if not process_galleries or source.scan_mode == "archives_only":
                 continue
 
-            galleries, skip_actions, container_dirs = _discover_galleries(base_path, data_root, settings)
+            galleries, skip_actions, container_dirs = _discover_galleries(base_path, data_root, settings, known_signatures)
             for skip_action in skip_actions:
                 _register_action(skip_action, summary, actions)
 
             # ensure container directories exist for nested outputs
-            if (settings.replicate_nesting and not settings.lanraragi_flatten) or ("foldercopy" in output_modes):
+            if ensure_containers:
                 for container in container_dirs:
-                    rel_dir = container.relative_to(data_root)
-                    target_dir = Path(env_settings.output_root) / _virtual_relpath(rel_dir, settings.replicate_nesting)
+                    rel_dir = to_data_rel(container)
+                    target_dir = output_path_for(str(rel_dir))
                     ensure_action = PlanAction(
                         action="ensure_output_dir",
                         type="container",
@@ -598,23 +1165,18 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
                     )
                     if not dry_run:
                         target_dir.mkdir(parents=True, exist_ok=True)
+                        outputs.changed(target_dir)
                     _register_action(ensure_action, summary, actions)
 
             for gallery in sorted(galleries, key=lambda g: str(g.rel_dir)):
                 rel_dir = gallery.rel_dir
-                if any(rel_dir.is_relative_to(exc) for exc in exclusions):
+                if is_excluded(rel_dir):
                     logger.debug("Skipping excluded gallery %s", rel_dir)
                     continue
                 sidecars: List[Path] = []
                 if settings.copy_sidecars:
                     sidecars = _gather_sidecars(gallery.path, settings.consider_images_in_subfolders)
 
-                modes_to_apply = []
-                if "zip" in output_modes:
-                    modes_to_apply.append("zip")
-                if "foldercopy" in output_modes:
-                    modes_to_apply.append("foldercopy")
-
                 # skip galleries with no images
                 if not gallery.images:
                     skip_action = PlanAction(
@@ -631,15 +1193,10 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
 
                 for mode in modes_to_apply:
                     if mode == "zip":
-                        extension = settings.archive_extension_for_galleries.lstrip(".")
-                        rel_file = rel_dir.parent / f"{rel_dir.name}.{extension}"
-                        target_path, virtual_target = _resolve_output_file(
-                            rel_file,
-                            settings.replicate_nesting,
-                            settings.lanraragi_flatten,
-                            flatten_name_map,
-                        )
-                        existing_record = await _get_record(session, target_path)
+                        rel_file = Path(f"{rel_dir}.{extension}")
+                        target_path, virtual_target = resolve_output(rel_file)
+                        await _settle(target_path)
+                        existing_record = records.get(str(target_path))
                         action = PlanAction(
                             action="zip_gallery",
                             type="gallery",
@@ -648,20 +1205,20 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
                             virtual_target=str(virtual_target),
                             relative_source=str(rel_dir),
                             signature=gallery.signature,
-                            similarity=float(fuzz.ratio(gallery.path.name, rel_dir.name)) / 100.0,
+                            similarity=_name_similarity(gallery.path.name, rel_dir.name),
                             decision="ZIP",
                             bytes=gallery.signature.get("total_image_bytes"),
                         )
 
-                        if target_path.exists():
-                            same_signature = existing_record and existing_record.signature_json and json.loads(existing_record.signature_json) == gallery.signature
+                        if outputs.exists(target_path):
+                            same_signature = _same_signature(existing_record, gallery.signature)
                             if same_signature:
                                 action.decision = "SKIP"
                                 action.reason = "SKIP_DUPLICATE_SAME_SIGNATURE"
                                 action.reason_code = "SKIP_DUPLICATE_SAME_SIGNATURE"
                                 if not dry_run:
                                     await log_activity(session, "INFO", "Gallery unchanged, skip", action.model_dump())
-                                    await _touch_record(session, target_path)
+                                    await _seen_record(target_path)
                                 _register_action(action, summary, actions)
                                 continue
 
@@ -677,57 +1234,59 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
                                 action.reason = "SKIP_OUTPUT_CONFLICT"
                                 action.reason_code = "SKIP_OUTPUT_CONFLICT"
                                 if not dry_run:
-                                    _plan_op("Writing duplicate gallery zip")
-                                    _write_zip(gallery.path, gallery.images, alt_target)
-                                    _complete_op("Writing duplicate gallery zip")
-                                    await _upsert_record(
-                                        session,
+                                    await _settle(alt_target)
+                                    await _queue_write(
+                                        _write_zip,
+                                        (gallery.path, gallery.images, alt_target),
                                         alt_target,
                                         gallery.path,
                                         "galleryzip",
                                         gallery.signature,
-                                        virtual_target_path=virtual_target,
+                                        virtual_target,
+                                        "Writing duplicate gallery zip",
+                                        "Gallery duplicate written",
+                                        action,
                                     )
-                                    await log_activity(session, "INFO", "Gallery duplicate written", action.model_dump())
                                 _register_action(action, summary, actions)
                                 continue
 
                             action.action = "overwrite_zip"
                             action.decision = "UPDATE"
                             if not dry_run:
-                                _plan_op("Updating gallery zip")
-                                _write_zip(gallery.path, gallery.images, target_path)
-                                _complete_op("Updating gallery zip")
-                                await _upsert_record(
-                                    session,
+                                await _queue_write(
+                                    _write_zip,
+                                    (gallery.path, gallery.images, target_path),
                                     target_path,
                                     gallery.path,
                                     "galleryzip",
                                     gallery.signature,
-                                    virtual_target_path=virtual_target,
+                                    virtual_target,
+                                    "Updating gallery zip",
+                                    "Gallery zip updated",
+                                    action,
                                 )
-                                await log_activity(session, "INFO", "Gallery zip updated", action.model_dump())
                             _register_action(action, summary, actions)
                             continue
 
                         if not dry_run:
-                            _plan_op("Writing gallery zip")
-                            _write_zip(gallery.path, gallery.images, target_path)
-                            _complete_op("Writing gallery zip")
-                            await _upsert_record(
-                                session,
+                            await _queue_write(
+                                _write_zip,
+                                (gallery.path, gallery.images, target_path),
                                 target_path,
                                 gallery.path,
                                 "galleryzip",
                                 gallery.signature,
-                                virtual_target_path=virtual_target,
+                                virtual_target,
+                                "Writing gallery zip",
+                                "Gallery zipped",
+                                action,
                             )
-                            await log_activity(session, "INFO", "Gallery zipped", action.model_dump())
                         _register_action(action, summary, actions)
 
                     if mode == "foldercopy":
-                        target_dir = Path(env_settings.output_root) / _virtual_relpath(rel_dir, settings.replicate_nesting)
-                        existing_record = await _get_record(session, target_dir)
+                        target_dir = output_path_for(str(rel_dir))
+                        await _settle(target_dir)
+                        existing_record = records.get(str(target_dir))
                         action = PlanAction(
                             action="foldercopy_gallery",
                             type="gallery",
@@ -739,18 +1298,18 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
                             bytes=gallery.signature.get("total_image_bytes"),
                         )
 
-                        same_signature = existing_record and existing_record.signature_json and json.loads(existing_record.signature_json) == gallery.signature
-                        if target_dir.exists() and same_signature:
+                        same_signature = _same_signature(existing_record, gallery.signature)
+                        if outputs.exists(target_dir) and same_signature:
                             action.decision = "SKIP"
                             action.reason = "SKIP_DUPLICATE_SAME_SIGNATURE"
                             action.reason_code = "SKIP_DUPLICATE_SAME_SIGNATURE"
                             if not dry_run:
                                 await log_activity(session, "INFO", "Folder copy unchanged, skip", action.model_dump())
-                                await _touch_record(session, target_dir)
+                                await _seen_record(target_dir)
                             _register_action(action, summary, actions)
                             continue
 
-                        if target_dir.exists() and not settings.update_gallery_zips:
+                        if outputs.exists(target_dir) and not settings.update_gallery_zips:
                             action.decision = "SKIP"
                             action.reason = "SKIP_OUTPUT_CONFLICT"
                             action.reason_code = "SKIP_OUTPUT_CONFLICT"
@@ -759,22 +1318,34 @@ async def perform_scan(session: AsyncSession, dry_run: bool = True) -> ScanResul
 
                         if not dry_run:
                             target_dir.mkdir(parents=True, exist_ok=True)
-                            _plan_op("Copying folder")
-                            _copy_folder_contents(gallery.path, gallery.images, sidecars, target_dir)
-                            _complete_op("Copying folder")
-                            await _upsert_record(
-                                session,
+                            await _queue_write(
+                                _copy_folder_contents,
+                                (gallery.path, gallery.images, sidecars, target_dir),
                                 target_dir,
                                 gallery.path,
                                 "foldercopy",
                                 gallery.signature,
-                                virtual_target_path=target_dir,
+                                target_dir,
+                                "Copying folder",
+                                "Folder copied",
+                                action,
                             )
-                            await log_activity(session, "INFO", "Folder copied", action.model_dump())
                         _register_action(action, summary, actions)
+            await _drain_writes()
+        await _commit_records(force=True)
     except Exception:
         set_status("error", message="Scan failed", progress=None, meta={"dry_run": dry_run})
         logger.debug("Scan failed", exc_info=True)
+        # keep records for outputs already written so the next scan does not treat them as conflicts
+        while pending_writes:
+            try:
+                await _finish_write()
+            except Exception:
+                logger.debug("Queued write failed while aborting scan", exc_info=True)
+        try:
+            await _commit_records(force=True)
+        except Exception:
+            logger.debug("Could not commit pending scan records", exc_info=True)
         raise
 
     result_payload = ScanResult(summary=summary, actions=actions)
@@ -794,8 +1365,14 @@ async def compute_diff(session: AsyncSession) -> DiffResult:
     settings = await get_settings(session)
     output_modes = {mode.strip() for mode in settings.output_mode.split("+")}
     process_galleries = settings.zip_galleries or ("foldercopy" in output_modes)
+    has_zip = "zip" in output_modes
+    has_foldercopy = "foldercopy" in output_modes
     data_root = Path(env_settings.data_root)
+    to_data_rel = _relative_to(data_root)
     flatten_name_map: Dict[str, str] = {}
+    resolve_output = _make_resolver(settings.replicate_nesting, settings.lanraragi_flatten, flatten_name_map)
+    output_path_for = _make_virtual_resolver(settings.replicate_nesting)
+    extension = settings.archive_extension_for_galleries.lstrip(".")
 
     current_items: Dict[str, Dict[str, object]] = {}
 
@@ -803,6 +1380,8 @@ async def compute_diff(session: AsyncSession) -> DiffResult:
     sources = sorted(result.scalars().all(), key=lambda s: s.path)
 
     logger.debug("Computing diff output_modes=%s settings=%s", output_modes, settings.model_dump())
+    record_map = await _load_records(session)
+    known_signatures = _known_gallery_signatures(record_map) if env_settings.trust_dir_mtime else None
 
     for source in sources:
         base_path = data_root / source.path
@@ -811,14 +1390,9 @@ async def compute_diff(session: AsyncSession) -> DiffResult:
             continue
 
         if source.scan_mode != "folders_only":
-            for archive_path in _iter_archives(base_path, settings.archive_extensions):
-                rel_path = archive_path.relative_to(data_root)
-                physical_target, virtual_target = _resolve_output_file(
-                    rel_path,
-                    settings.replicate_nesting,
-                    settings.lanraragi_flatten,
-                    flatten_name_map,
-                )
+            for archive_path in _iter_archives(base_path, settings.archive_ext_set):
+                rel_path = to_data_rel(archive_path)
+                physical_target, virtual_target = resolve_output(rel_path)
                 current_items[str(physical_target)] = {
                     "virtual_target": str(virtual_target),
                     "source_path": str(archive_path),
@@ -829,18 +1403,12 @@ async def compute_diff(session: AsyncSession) -> DiffResult:
         if not process_galleries or source.scan_mode == "archives_only":
             continue
 
-        galleries, _, _ = _discover_galleries(base_path, data_root, settings)
+        galleries, _, _ = _discover_galleries(base_path, data_root, settings, known_signatures)
         for gallery in galleries:
             rel_dir = gallery.rel_dir
-            if "zip" in output_modes:
-                extension = settings.archive_extension_for_galleries.lstrip(".")
-                rel_file = rel_dir.parent / f"{rel_dir.name}.{extension}"
-                physical_target, virtual_target = _resolve_output_file(
-                    rel_file,
-                    settings.replicate_nesting,
-                    settings.lanraragi_flatten,
-                    flatten_name_map,
-                )
+            if has_zip:
+                rel_file = Path(f"{rel_dir}.{extension}")
+                physical_target, virtual_target = resolve_output(rel_file)
                 current_items[str(physical_target)] = {
                     "virtual_target": str(virtual_target),
                     "source_path": str(gallery.path),
@@ -848,8 +1416,8 @@ async def compute_diff(session: AsyncSession) -> DiffResult:
                     "signature": gallery.signature,
                 }
 
-            if "foldercopy" in output_modes:
-                target_dir = Path(env_settings.output_root) / _virtual_relpath(rel_dir, settings.replicate_nesting)
+            if has_foldercopy:
+                target_dir = output_path_for(str(rel_dir))
                 current_items[str(target_dir)] = {
                     "virtual_target": str(target_dir),
                     "source_path": str(gallery.path),
@@ -857,8 +1425,6 @@ async def compute_diff(session: AsyncSession) -> DiffResult:
                     "signature": gallery.signature,
                 }
 
-    existing_records = (await session.execute(select(models.ArchiveRecord))).scalars().all()
-    record_map = {rec.target_path: rec for rec in existing_records}
     new_items: List[DiffItem] = []
     changed_items: List[DiffItem] = []
     unchanged_items: List[DiffItem] = []
@@ -879,8 +1445,8 @@ async def compute_diff(session: AsyncSession) -> DiffResult:
             )
             continue
 
-        record_sig = json.loads(record.signature_json or "{}")
-        if record_sig == item.get("signature"):
+        # text match first: records written by a scan need no parse when unchanged
+        if _same_signature(record, item.get("signature")):
             unchanged_items.append(
                 DiffItem(
                     status="unchanged",
@@ -903,9 +1469,13 @@ async def compute_diff(session: AsyncSession) -> DiffResult:
                 )
             )
 
-    for record in existing_records:
-        source_path = Path(record.source_path)
-        if not source_path.exists():
+    # a record whose target is current from the same source was just walked; only the others need
+    # their source stat'ed
+    for target, record in record_map.items():
+        item = current_items.get(target)
+        if item is not None and item["source_path"] == record.source_path:
+            continue
+        if not os.path.exists(record.source_path):
             missing_items.append(
                 DiffItem(
                     status="missing",
@@ -913,7 +1483,7 @@ async def compute_diff(session: AsyncSession) -> DiffResult:
                     virtual_target_path=record.virtual_target_path,
                     source_path=record.source_path,
                     type=record.type,
-                    signature=json.loads(record.signature_json or "{}"),
+                    signature=orjson.loads(record.signature_json or "{}"),
                 )
             )
 
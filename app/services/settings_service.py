@@ -1,6 +1,8 @@
-import json
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
+import orjson
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings as env_settings
@@ -8,6 +10,9 @@ from app.core import models
 from app.api.schemas import SettingsPayload, SettingsUpdate
 from app.core.logging_utils import reconfigure_logging
 
+# set when auto-scan settings change so the auto-scan loop re-reads them without waiting out its sleep
+settings_changed = threading.Event()
+
 def _normalize_ext(exts: Iterable[str]) -> list[str]:
     seen = set()
     normalized = []
@@ -19,6 +24,11 @@ def _normalize_ext(exts: Iterable[str]) -> list[str]:
         normalized.append(clean)
     return normalized
 
+@lru_cache(maxsize=64)
+def _stored_ext(raw: str) -> tuple[str, ...]:
+    # settings are re-read for every scan and request; the stored lists rarely change
+    return tuple(_normalize_ext(orjson.loads(raw or "[]")))
+
 def _row_to_payload(row: models.SettingsRow | None) -> SettingsPayload:
     if row is None:
         return SettingsPayload(
@@ -59,8 +69,8 @@ def _row_to_payload(row: models.SettingsRow | None) -> SettingsPayload:
         auto_scan_interval_minutes=_get("auto_scan_interval_minutes", env_settings.auto_scan_interval_minutes),
         duplicates_enabled=_get("duplicates_enabled", True),
         min_images_to_be_gallery=_get("min_images_to_be_gallery", env_settings.min_images_to_be_gallery),
-        archive_extensions=_normalize_ext(json.loads(_get("archive_extensions", "[]") or "[]")),
-        image_extensions=_normalize_ext(json.loads(_get("image_extensions", "[]") or "[]")),
+        archive_extensions=list(_stored_ext(_get("archive_extensions", "[]"))),
+        image_extensions=list(_stored_ext(_get("image_extensions", "[]"))),
     )
 
 async def get_settings(session: AsyncSession) -> SettingsPayload:
@@ -83,8 +93,8 @@ async def get_settings(session: AsyncSession) -> SettingsPayload:
             auto_scan_interval_minutes=payload.auto_scan_interval_minutes,
             duplicates_enabled=payload.duplicates_enabled,
             min_images_to_be_gallery=payload.min_images_to_be_gallery,
-            archive_extensions=json.dumps(payload.archive_extensions),
-            image_extensions=json.dumps(payload.image_extensions),
+            archive_extensions=orjson.dumps(payload.archive_extensions).decode(),
+            image_extensions=orjson.dumps(payload.image_extensions).decode(),
         )
         session.add(new_row)
         await session.commit()
@@ -100,6 +110,7 @@ async def update_settings(session: AsyncSession, update: SettingsUpdate) -> Sett
         session.add(row)
 
     old_debug = row.debug_logging if row else env_settings.debug_logging
+    old_auto_scan = (row.auto_scan_enabled, row.auto_scan_interval_minutes)
 
     if update.zip_galleries is not None:
         row.zip_galleries = update.zip_galleries
@@ -130,13 +141,15 @@ async def update_settings(session: AsyncSession, update: SettingsUpdate) -> Sett
     if update.min_images_to_be_gallery is not None:
         row.min_images_to_be_gallery = update.min_images_to_be_gallery
     if update.archive_extensions is not None:
-        row.archive_extensions = json.dumps(_normalize_ext(update.archive_extensions))
+        row.archive_extensions = orjson.dumps(_normalize_ext(update.archive_extensions)).decode()
     if update.image_extensions is not None:
-        row.image_extensions = json.dumps(_normalize_ext(update.image_extensions))
+        row.image_extensions = orjson.dumps(_normalize_ext(update.image_extensions)).decode()
 
     await session.commit()
     await session.refresh(row)
     payload = _row_to_payload(row)
     if row.debug_logging != old_debug:
         reconfigure_logging(Path(env_settings.config_root), row.debug_logging)
+    if (row.auto_scan_enabled, row.auto_scan_interval_minutes) != old_auto_scan:
+        settings_changed.set()
     return payload
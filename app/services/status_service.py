@@ -1,8 +1,8 @@
-import threading
 import time
 from typing import Any, Dict, Optional
 
-_lock = threading.Lock()
+# status is an immutable snapshot: writers build a new dict and rebind it (a single atomic
+# reference swap), so pollers read it without taking a lock. Never mutate it in place.
 _status: Dict[str, Any] = {
     "state": "standby",
     "message": "Idle",
@@ -13,18 +13,16 @@ _status: Dict[str, Any] = {
 
 
 def set_status(state: str, message: Optional[str] = None, progress: Optional[float] = None, meta: Optional[Dict[str, Any]] = None):
-    with _lock:
-        _status.update(
-            {
-                "state": state,
-                "message": message or _status.get("message", ""),
-                "progress": progress,
-                "meta": meta or _status.get("meta", {}),
-                "updated_at": time.time(),
-            }
-        )
+    global _status
+    current = _status
+    _status = {
+        "state": state,
+        "message": message or current.get("message", ""),
+        "progress": progress,
+        "meta": meta or current.get("meta", {}),
+        "updated_at": time.time(),
+    }
 
 
 def get_status() -> Dict[str, Any]:
-    with _lock:
-        return dict(_status)
+    return _status
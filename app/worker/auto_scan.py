@@ -3,19 +3,26 @@ import logging
 import os
 import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List
 
 from sqlalchemy import select
 
+try:  # installed with uvicorn[standard]
+    from watchfiles import Change, watch
+except ImportError:
+    Change = watch = None
+
 from app.core.config import settings as env_settings
 from app.core.db import SessionLocal
 from app.core import models
-from app.services.settings_service import get_settings
-from app.services.scan_service import perform_scan
+from app.services.settings_service import get_settings, settings_changed
+from app.services.scan_service import _name_ext, perform_scan
 from app.worker.jobs import enqueue
-from app.worker.queue import job_status
+from app.worker.queue import running_jobs
 
 logger = logging.getLogger("galleryloom.auto")
 
@@ -23,35 +30,202 @@ _thread: threading.Thread | None = None
 _stop_event = threading.Event()
 
 
+_DIR_MTIME_SLACK = 2.0  # listings taken this close to a directory's mtime are not reused
+
+
+@dataclass
+class _DirListing:
+    mtime: float
+    listed_at: float
+    subdirs: List[str]
+    files: List[str]
+    newest: float = 0.0
+
+
 @dataclass
 class SourceSnapshot:
     latest_mtime: float = 0.0
+    exts: frozenset = frozenset()
+    listings: Dict[str, _DirListing] = field(default_factory=dict)
+
+
+def _list_dir(path: str, extset: frozenset[str], dir_mtime: float, now: float) -> _DirListing | None:
+    subdirs: List[str] = []
+    files: List[str] = []
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return None
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif _name_ext(entry.name) in extset and entry.is_file():
+                    files.append(entry.path)
+            except OSError:
+                continue
+    return _DirListing(dir_mtime, now, subdirs, files)
 
 
-def _iter_files(base: Path, exts: Iterable[str]) -> Iterable[Path]:
-    extset = {e.lower().lstrip(".") for e in exts}
-    for root, _, files in os.walk(base):
-        files.sort()
-        for name in files:
-            p = Path(root) / name
-            if p.is_file() and p.suffix.lower().lstrip(".") in extset:
-                yield p
+_STAT_BATCH = 64  # file stats per pool task
+_STAT_WORKERS = 4
+_SLOW_STAT_SECS = 50e-6  # local cached stats take a few µs; slower means a network mount or cold disk
 
 
-def _latest_mtime(base: Path, exts: Iterable[str]) -> float:
-    newest = 0.0
-    for p in _iter_files(base, exts):
+@lru_cache(maxsize=1)
+def _stat_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=_STAT_WORKERS, thread_name_prefix="gloom-stat")
+
+
+def _stat_batch(batch: List[tuple[_DirListing, str]]) -> List[tuple[_DirListing, float]]:
+    mtimes = []
+    for listing, file in batch:
         try:
-            m = p.stat().st_mtime
-            if m > newest:
-                newest = m
-        except FileNotFoundError:
+            mtimes.append((listing, os.stat(file).st_mtime))
+        except OSError:
             continue
+    return mtimes
+
+
+def _newer_than(mtimes: List[tuple[_DirListing, float]], threshold: float) -> float | None:
+    return max((m for _, m in mtimes if m > threshold), default=None)
+
+
+def _latest_mtime(
+    base: Path,
+    exts: Iterable[str],
+    listings: Dict[str, _DirListing] | None = None,
+    threshold: float | None = None,
+) -> float:
+    """Newest mtime among matching files under base; dir symlinks are not followed.
+
+    ``listings`` carries directory listings between calls: a directory whose mtime has not moved is
+    not re-listed, and with GLOOM_TRUST_DIR_MTIME its files are not re-stat'ed either. With
+    ``threshold`` the walk stops at the first file newer than it and returns that file's mtime
+    (discarding ``listings``, which are then incomplete).
+    """
+    extset = exts if isinstance(exts, frozenset) else frozenset(e.lower().lstrip(".") for e in exts)
+    previous = listings or {}
+    seen: Dict[str, _DirListing] = {}
+    now = time.time()
+    # file stats are independent, so when they are slow (network mounts, where each one is a request
+    # to the server) batches run on a few threads while the walk continues; the first batch is timed
+    # inline to decide, since for fast local stats the threads only add overhead
+    batch: List[tuple[_DirListing, str]] = []
+    results: List[List[tuple[_DirListing, float]]] = []
+    futures = []
+    overlap: bool | None = None
+    found: float | None = None
+    stack = [str(base)]
+    while stack and found is None:
+        path = stack.pop()
+        try:
+            dir_mtime = os.stat(path).st_mtime
+        except OSError:
+            continue
+        listing = previous.get(path)
+        reuse = listing is not None and listing.mtime == dir_mtime and dir_mtime < listing.listed_at - _DIR_MTIME_SLACK
+        if not (reuse and env_settings.trust_dir_mtime):
+            if not reuse:
+                listing = _list_dir(path, extset, dir_mtime, now)
+                if listing is None:
+                    continue
+            listing.newest = 0.0
+            if overlap is False:
+                for file in listing.files:
+                    try:
+                        m = os.stat(file).st_mtime
+                    except OSError:
+                        continue
+                    if m > listing.newest:
+                        listing.newest = m
+            else:
+                for file in listing.files:
+                    batch.append((listing, file))
+                    if len(batch) >= _STAT_BATCH:
+                        if overlap:
+                            futures.append(_stat_pool().submit(_stat_batch, batch))
+                        else:
+                            started = time.perf_counter()
+                            mtimes = _stat_batch(batch)
+                            overlap = (time.perf_counter() - started) / len(batch) > _SLOW_STAT_SECS
+                            results.append(mtimes)
+                            if threshold is not None and (found := _newer_than(mtimes, threshold)) is not None:
+                                break
+                        batch = []
+        seen[path] = listing
+        stack.extend(listing.subdirs)
+        if threshold is not None and found is None and listing.newest > threshold:
+            found = listing.newest
+    if found is not None:
+        for future in futures:
+            future.cancel()
+        if listings is not None:
+            listings.clear()
+        return found
+    results.append(_stat_batch(batch))
+    results.extend(future.result() for future in futures)
+    for mtimes in results:
+        for listing, m in mtimes:
+            if m > listing.newest:
+                listing.newest = m
+    newest = max((listing.newest for listing in seen.values()), default=0.0)
+    if listings is not None:
+        listings.clear()
+        listings.update(seen)
     return newest
 
 
+class _SourceWatcher:
+    """Collects which sources saw added/modified media files, via filesystem events instead of polling."""
+
+    def __init__(self, roots: Dict[int, str], exts: frozenset):
+        self.roots = roots
+        self.exts = exts
+        self.failed = False
+        self._changed: set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="gloom-watch")
+        self._thread.start()
+
+    def _wanted(self, change, path: str) -> bool:
+        if change == Change.deleted:
+            return False
+        return _name_ext(os.path.basename(path)) in self.exts or os.path.isdir(path)
+
+    def _run(self):
+        try:
+            for changes in watch(
+                *self.roots.values(),
+                watch_filter=self._wanted,
+                stop_event=self._stop,
+                raise_interrupt=False,
+                ignore_permission_denied=True,
+            ):
+                with self._lock:
+                    for _, path in changes:
+                        for source_id, root in self.roots.items():
+                            if path == root or path.startswith(root + os.sep):
+                                self._changed.add(source_id)
+        except Exception:
+            logger.warning("Source watcher stopped; falling back to mtime polling", exc_info=True)
+            self.failed = True
+
+    def pop_changed(self) -> set[int]:
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=2)
+
+
 def _any_job_running() -> bool:
-    return any(status == "running" for status in job_status.values())
+    return bool(running_jobs())
 
 
 def _enqueue_scan(reason: str):
@@ -59,7 +233,7 @@ def _enqueue_scan(reason: str):
         async with SessionLocal() as session:
             await perform_scan(session, dry_run=False)
 
-    job_id = enqueue(f"scan_auto_{reason}", lambda: asyncio.run(_job()))
+    job_id = enqueue(f"scan_auto_{reason}", _job)
     logger.info("Auto scan enqueued (reason=%s) job_id=%s", reason, job_id)
     return job_id
 
@@ -74,8 +248,15 @@ def start_auto_scan_thread():
     logger.info("Auto-scan thread started")
 
 
+def _sleep(seconds: float):
+    # returns early when auto-scan settings change or the thread is being stopped
+    if settings_changed.wait(seconds):
+        settings_changed.clear()
+
+
 def stop_auto_scan_thread():
     _stop_event.set()
+    settings_changed.set()  # wake the loop out of its current wait
     if _thread:
         _thread.join(timeout=2)
 
@@ -84,15 +265,18 @@ def _loop():
     last_full_scan = 0.0
     source_snapshots: Dict[int, SourceSnapshot] = {}
     last_mtime_check = 0.0
+    watcher: _SourceWatcher | None = None
+    # settings are polled every few seconds; reuse one loop rather than asyncio.run() per tick
+    loop = asyncio.new_event_loop()
     while not _stop_event.is_set():
         try:
             if _any_job_running():
-                time.sleep(5)
+                _sleep(5)
                 continue
 
-            settings, sources = asyncio.run(_load_settings_and_sources())
+            settings, sources = loop.run_until_complete(_load_settings_and_sources())
             if not settings.auto_scan_enabled:
-                time.sleep(10)
+                _sleep(10)
                 continue
 
             now = time.time()
@@ -104,21 +288,43 @@ def _loop():
             if need_full:
                 trigger_reason = "interval"
 
-            if trigger_reason is None and now - last_mtime_check > 20:
+            if env_settings.auto_scan_watch and watch is not None:
+                exts = settings.image_ext_set | settings.archive_ext_set
+                roots = {}
+                for src in sources:
+                    base = Path(env_settings.data_root) / src.path
+                    if base.exists():
+                        roots[src.id] = str(base)
+                if watcher is None or watcher.failed or watcher.roots != roots or watcher.exts != exts:
+                    if watcher:
+                        watcher.stop()
+                    watcher = _SourceWatcher(roots, exts) if roots else None
+
+            if watcher and not watcher.failed:
+                changed = watcher.pop_changed()
+                if trigger_reason is None and changed:
+                    trigger_reason = f"change_source_{min(changed)}"
+                    logger.debug("Change events for sources %s", sorted(changed))
+            elif trigger_reason is None and now - last_mtime_check > 20:
                 # detect changes in input files
                 last_mtime_check = now
+                exts = settings.image_ext_set | settings.archive_ext_set
                 for src in sources:
                     base = Path(env_settings.data_root) / src.path
                     if not base.exists():
                         continue
-                    latest = _latest_mtime(base, list(settings.image_extensions) + list(settings.archive_extensions))
-                    snap = source_snapshots.get(src.id) or SourceSnapshot(latest_mtime=latest)
-                    if latest > snap.latest_mtime:
+                    snap = source_snapshots.get(src.id)
+                    listings = snap.listings if snap and snap.exts == exts else {}
+                    previous = snap.latest_mtime if snap else None
+                    # stops at the first file newer than the snapshot; one is enough to schedule a scan
+                    latest = _latest_mtime(base, exts, listings, threshold=previous)
+                    if previous is not None and latest > previous:
+                        # files up to now are covered by the scan this schedules; newer ones re-trigger
+                        source_snapshots[src.id] = SourceSnapshot(latest_mtime=max(latest, now), exts=exts, listings=listings)
                         trigger_reason = f"change_source_{src.id}"
-                        source_snapshots[src.id] = SourceSnapshot(latest_mtime=latest)
-                        logger.debug("Change detected for source %s (mtime %.2f -> %.2f)", src.path, snap.latest_mtime, latest)
+                        logger.debug("Change detected for source %s (mtime %.2f -> %.2f)", src.path, previous, latest)
                         break
-                    source_snapshots[src.id] = SourceSnapshot(latest_mtime=latest)
+                    source_snapshots[src.id] = SourceSnapshot(latest_mtime=latest, exts=exts, listings=listings)
 
             if trigger_reason and not _any_job_running():
                 job_id = _enqueue_scan(trigger_reason)
@@ -127,7 +333,10 @@ def _loop():
 
         except Exception:
             logger.error("Auto-scan loop error", exc_info=True)
-        time.sleep(5)
+        _sleep(5)
+    if watcher:
+        watcher.stop()
+    loop.close()
 
 
 async def _load_settings_and_sources():
@@ -1,15 +1,19 @@
+import asyncio
 import logging
 import threading
 import traceback
+from contextvars import ContextVar
 from .queue import job_queue, Job, set_status, get_status, enqueue_job
 
 logger = logging.getLogger("galleryloom.worker")
 _worker_started = False
-_job_ctx = threading.local()
+# set in the worker thread before a job runs; the job's task copies the context, so
+# everything it spawns on the worker loop sees it too
+current_job_id: ContextVar[str | None] = ContextVar("current_job_id", default=None)
 
 
 def get_current_job_id() -> str | None:
-    return getattr(_job_ctx, "job_id", None)
+    return current_job_id.get()
 
 def start_worker():
     global _worker_started
@@ -18,20 +22,25 @@ def start_worker():
     _worker_started = True
 
     def run():
+        # one event loop for the worker's lifetime instead of asyncio.run() per job
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
         while True:
             job: Job = job_queue.get()
             set_status(job.id, "running")
             logger.debug("Worker starting job %s (%s)", job.id, job.name)
+            token = current_job_id.set(job.id)
             try:
-                _job_ctx.job_id = job.id
-                job.fn()
+                result = job.fn()
+                if asyncio.iscoroutine(result):
+                    loop.run_until_complete(result)
                 set_status(job.id, "done")
                 logger.debug("Worker completed job %s", job.id)
             except Exception:
                 set_status(job.id, "failed")
                 logger.error("Job failed %s: %s", job.name, traceback.format_exc())
             finally:
-                _job_ctx.job_id = None
+                current_job_id.reset(token)
                 job_queue.task_done()
 
     t = threading.Thread(target=run, daemon=True)
@@ -39,6 +48,7 @@ def start_worker():
     logger.info("Worker started")
 
 def enqueue(name: str, fn):
+    """Queue ``fn`` for the worker thread; a coroutine function runs on the worker's event loop."""
     return enqueue_job(name, fn)
 
 def job_status(job_id: str) -> str | None:
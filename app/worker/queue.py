@@ -15,6 +15,11 @@ class Job:
 
 job_queue: "queue.Queue[Job]" = queue.Queue()
 job_status: dict[str, str] = {}
+# insertion-ordered set of job ids currently marked "running"
+_running: dict[str, None] = {}
+# finished job ids, oldest first; only the most recent are kept so job_status stays bounded
+_finished: dict[str, None] = {}
+_KEEP_FINISHED = 256
 _status_lock = threading.Lock()
 
 def enqueue_job(name: str, fn: Callable[[], Any]) -> str:
@@ -28,7 +33,22 @@ def enqueue_job(name: str, fn: Callable[[], Any]) -> str:
 def set_status(job_id: str, status: str):
     with _status_lock:
         job_status[job_id] = status
+        if status == "running":
+            _running[job_id] = None
+        else:
+            _running.pop(job_id, None)
+        if status in ("done", "failed"):
+            _finished.pop(job_id, None)
+            _finished[job_id] = None
+            while len(_finished) > _KEEP_FINISHED:
+                oldest = next(iter(_finished))
+                del _finished[oldest]
+                job_status.pop(oldest, None)
 
 def get_status(job_id: str) -> str | None:
     with _status_lock:
         return job_status.get(job_id)
+
+def running_jobs() -> list[str]:
+    with _status_lock:
+        return list(_running)
@@ -0,0 +1,18 @@
+from unittest import TestCase
+
+from fastapi import HTTPException
+
+from app.api.paths import sanitize_rel_path
+
+
+class SanitizeRelPathTests(TestCase):
+    def test_canonicalizes_components(self):
+        self.assertEqual(sanitize_rel_path("  /a//b/./c/ "), "a/b/c")
+        self.assertEqual(sanitize_rel_path("/"), "")
+        self.assertEqual(sanitize_rel_path("a..b/c"), "a..b/c")
+
+    def test_rejects_parent_components(self):
+        for bad in ("..", "../a", "a/../b", "/a/b/.."):
+            with self.assertRaises(HTTPException) as ctx:
+                sanitize_rel_path(bad)
+            self.assertEqual(ctx.exception.status_code, 400)
@@ -34,3 +34,15 @@ class BrowsePathTests(TestCase):
             self.assertEqual(normalized, base)
             with self.assertRaises(HTTPException):
                 routes_fs._normalize_root(str(base / "other"))
+
+    def test_list_dirs_skips_files_and_symlinks(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir).resolve()
+            target = base / "sub"
+            (target / "beta").mkdir(parents=True)
+            (target / "Alpha").mkdir()
+            (target / "file.txt").write_bytes(b"x")
+            (target / "link").symlink_to(base)
+            dirs, truncated = routes_fs._list_dirs(target, "sub")
+            self.assertFalse(truncated)
+            self.assertEqual([(d.name, d.path) for d in dirs], [("Alpha", "sub/Alpha"), ("beta", "sub/beta")])
@@ -0,0 +1,36 @@
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import TestCase
+
+from app.api import routes_galleries
+
+
+class ExtractArchiveTests(TestCase):
+    def _archive(self, tmp: Path, names: list[str]) -> Path:
+        archive = tmp / "upload.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            for name in names:
+                zf.writestr(name, b"data")
+        return archive
+
+    def test_extracts_safe_members(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            archive = self._archive(tmp, ["a.jpg", "sub/b.jpg"])
+            extract_dir = tmp / "out"
+            extract_dir.mkdir()
+            routes_galleries._extract_archive(archive, extract_dir)
+            self.assertTrue((extract_dir / "sub" / "b.jpg").exists())
+
+    def test_rejects_traversal_before_writing(self):
+        for bad in ("../evil.jpg", "sub/../../evil.jpg", "/abs/evil.jpg"):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                tmp = Path(tmpdir)
+                archive = self._archive(tmp, ["ok.jpg", bad])
+                extract_dir = tmp / "out"
+                extract_dir.mkdir()
+                with self.assertRaises(ValueError):
+                    routes_galleries._extract_archive(archive, extract_dir)
+                self.assertEqual(list(extract_dir.iterdir()), [])
+                self.assertFalse((tmp / "evil.jpg").exists())
@@ -0,0 +1,33 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from app.api import routes_logs
+
+
+class TailTests(TestCase):
+    def _expected(self, path: Path, lines: int) -> list[str]:
+        with path.open("r", encoding="utf-8", errors="ignore") as fh:
+            return [line.rstrip("\n") for line in fh][-lines:]
+
+    def test_tail_matches_full_read(self):
+        samples = [
+            b"",
+            b"\n",
+            b"one",
+            b"one\ntwo\n",
+            b"one\ntwo\nthree",
+            b"a\n\nb\n\n",
+            b"".join(f"line {i}\n".encode() for i in range(200)),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "app.log"
+            # tiny blocks force the backwards reader across many block boundaries
+            with mock.patch.object(routes_logs, "TAIL_BLOCK_SIZE", 7):
+                for content in samples:
+                    path.write_bytes(content)
+                    for lines in (1, 2, 3, 50, 1000):
+                        self.assertEqual(routes_logs._tail(path, lines), self._expected(path, lines), (content[:20], lines))
+
+    def test_tail_missing_file(self):
+        self.assertEqual(routes_logs._tail(Path("/nonexistent/galleryloom.log"), 10), [])
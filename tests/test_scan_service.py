@@ -2,6 +2,7 @@ import errno
 import os
 import tempfile
 import zipfile
+import zlib
 from pathlib import Path
 from unittest import TestCase, mock
 
@@ -10,24 +11,16 @@ from app.services import scan_service
 
 
 class WriteZipTests(TestCase):
-    def setUp(self):
-        self._orig_tmp_root = env_settings.tmp_root
-        self._orig_temp_dir = getattr(env_settings, "temp_dir", None)
-
-    def tearDown(self):
-        env_settings.tmp_root = self._orig_tmp_root
-        env_settings.temp_dir = self._orig_temp_dir
-
     def test_write_zip_handles_exdev_fallback(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             target_dir = Path(tmpdir) / "out"
             gallery_dir = Path(tmpdir) / "gallery"
             gallery_dir.mkdir(parents=True, exist_ok=True)
             img = gallery_dir / "image.txt"
-            img.write_text("demo")
+            img.write_bytes(b"demo")
 
-            env_settings.tmp_root = str(Path(tmpdir) / "tmp")
-            Path(env_settings.tmp_root).mkdir(parents=True, exist_ok=True)
+            tmp_root = Path(tmpdir) / "tmp"
+            tmp_root.mkdir(parents=True, exist_ok=True)
             target_zip = target_dir / "archive.zip"
 
             replace_calls = {"count": 0}
@@ -39,7 +32,10 @@ class WriteZipTests(TestCase):
                     raise OSError(errno.EXDEV, "Invalid cross-device link")
                 return real_replace(src, dst)
 
-            with mock.patch("os.replace", side_effect=fake_replace):
+            with (
+                mock.patch.object(env_settings, "tmp_root", str(tmp_root)),
+                mock.patch.object(scan_service, "_replace", side_effect=fake_replace),
+            ):
                 scan_service._write_zip(gallery_dir, [img], target_zip)
 
             self.assertTrue(target_zip.exists())
@@ -54,22 +50,79 @@ class WriteZipTests(TestCase):
             gallery_dir = Path(tmpdir) / "gallery2"
             gallery_dir.mkdir(parents=True, exist_ok=True)
             img = gallery_dir / "image2.txt"
-            img.write_text("demo")
+            img.write_bytes(b"demo")
 
-            env_settings.tmp_root = str(Path(tmpdir) / "tmp")
-            env_settings.temp_dir = None
             target_zip = target_dir / "gallery.zip"
 
             real_ntf = scan_service.tempfile.NamedTemporaryFile
             created_dirs: list[Path] = []
+            buffering: list[int] = []
 
             def recording_ntf(*args, **kwargs):
                 created_dirs.append(Path(kwargs.get("dir")).resolve())
+                buffering.append(kwargs.get("buffering"))
                 return real_ntf(*args, **kwargs)
 
-            with mock.patch("app.services.scan_service.tempfile.NamedTemporaryFile", side_effect=recording_ntf):
+            with (
+                mock.patch.object(env_settings, "tmp_root", str(Path(tmpdir) / "tmp")),
+                mock.patch.object(env_settings, "temp_dir", None),
+                mock.patch("app.services.scan_service.tempfile.NamedTemporaryFile", side_effect=recording_ntf),
+            ):
                 scan_service._write_zip(gallery_dir, [img], target_zip)
 
             self.assertTrue(created_dirs)
             self.assertEqual(created_dirs[0], target_zip.parent.resolve())
+            self.assertEqual(buffering[0], scan_service._ZIP_BUFFER)
             self.assertTrue(target_zip.exists())
+
+    def test_write_zip_stores_precompressed_images(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gallery_dir = Path(tmpdir) / "gallery3"
+            gallery_dir.mkdir(parents=True, exist_ok=True)
+            jpg = gallery_dir / "01.jpg"
+            jpg.write_bytes(b"\xff" * 512)
+            bmp = gallery_dir / "02.bmp"
+            bmp.write_bytes(b"\x00" * 512)
+            target_zip = Path(tmpdir) / "out" / "gallery.zip"
+
+            scan_service._write_zip(gallery_dir, [jpg, bmp], target_zip)
+
+            with zipfile.ZipFile(target_zip, "r") as zf:
+                self.assertEqual(zf.getinfo("01.jpg").compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(zf.getinfo("02.bmp").compress_type, zipfile.ZIP_DEFLATED)
+                self.assertIsNone(zf.testzip())
+
+    def test_write_zip_fast_io_matches_buffered_output(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gallery_dir = Path(tmpdir) / "gallery4"
+            gallery_dir.mkdir(parents=True, exist_ok=True)
+            images = []
+            for idx, ext in enumerate(["jpg", "bmp", "png"]):
+                img = gallery_dir / f"{idx:02d}.{ext}"
+                img.write_bytes(bytes([idx]) * (70000 + idx))
+                images.append(img)
+            buffered = Path(tmpdir) / "out" / "buffered.zip"
+            streamed = Path(tmpdir) / "out" / "streamed.zip"
+
+            with mock.patch.object(env_settings, "zip_fast_io", False):
+                scan_service._write_zip(gallery_dir, images, buffered)
+            with mock.patch.object(env_settings, "zip_fast_io", True):
+                scan_service._write_zip(gallery_dir, images, streamed)
+
+            self.assertEqual(buffered.read_bytes(), streamed.read_bytes())
+            with zipfile.ZipFile(streamed, "r") as zf:
+                self.assertIsNone(zf.testzip())
+
+    def test_file_crc_reuses_thread_buffer(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data = bytes(range(256)) * 5000
+            path = Path(tmpdir) / "big.jpg"
+            path.write_bytes(data)
+
+            first = scan_service._file_crc(path)
+            buf = scan_service._stream_buffers.buf
+            second = scan_service._file_crc(path)
+
+            self.assertEqual(first, (zlib.crc32(data), len(data)))
+            self.assertEqual(second, first)
+            self.assertIs(scan_service._stream_buffers.buf, buf)